@@ -2,6 +2,7 @@
 """
 Python backend example for yai-nexus-fekit, using AGUIAdapter.
 """
+import json
 import os
 import time
 import uuid
@@ -12,7 +13,7 @@ from ag_ui.core import RunAgentInput
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from langchain_core.messages import BaseMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph
@@ -275,13 +276,19 @@ app.add_middleware(
 #     data: Dict[str, Any]
 
 
-@app.get("/")
-async def root():
-    return {
+# 根路径返回固定内容，启动时序列化一次，避免每次请求重复编码
+_ROOT_PAYLOAD = json.dumps(
+    {
         "message": "YAI Nexus FeKit Python Backend",
         "version": "0.1.0",
         "status": "running",
     }
+).encode("utf-8")
+
+
+@app.get("/")
+async def root():
+    return Response(content=_ROOT_PAYLOAD, media_type="application/json")
 
 
 @app.get("/health")
@@ -1,72 +1,102 @@
 # -*- coding: utf-8 -*-
 """
 yai-nexus-agentkit: 一个灵活、可扩展的智能体开发套件。
+
+公开对象按需导入（PEP 562）：``import yai_nexus_agentkit`` 本身不会加载
+langchain_core、ag_ui、tortoise、loguru 等重量级依赖，首次访问对应名称时才导入。
 """
 
-from .adapter import (
-    AGUIAdapter,
-    Task,
-)
-from .core.logger_config import (
-    LoggerConfigurator,
-    LogPathStrategy,
-    configure_logging,
-    get_logger,
-    logger,
-)
-from .llm import (
-    AnthropicModel,
-    BaseChatModel,
-    DoubaoModel,
-    LLMConfig,
-    LLMFactory,
-    LLMProvider,
-    OpenAIModel,
-    OpenRouterModel,
-    TongyiModel,
-    ZhipuModel,
-    llm_factory,
-)
-from .persistence import (
-    TORTOISE_ORM_CONFIG_TEMPLATE,
-    AgentConversation,
-    AgentMessage,
-    ConversationRepository,
-    DatabaseConfig,
-    PostgresCheckpoint,
-    TortoiseRepository,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-__all__ = [
+# 公开名称 -> 定义所在的子模块
+_LAZY_IMPORTS = {
     # LLM 核心功能
-    "LLMFactory",
-    "llm_factory",
-    "BaseChatModel",
+    "LLMFactory": ".llm",
+    "llm_factory": ".llm",
+    "get_llm_factory": ".llm",
+    "BaseChatModel": ".llm",
     # 配置和提供商
-    "LLMConfig",
-    "LLMProvider",
+    "LLMConfig": ".llm",
+    "LLMProvider": ".llm",
     # 模型枚举
-    "OpenAIModel",
-    "AnthropicModel",
-    "ZhipuModel",
-    "TongyiModel",
-    "DoubaoModel",
-    "OpenRouterModel",
+    "OpenAIModel": ".llm",
+    "AnthropicModel": ".llm",
+    "ZhipuModel": ".llm",
+    "TongyiModel": ".llm",
+    "DoubaoModel": ".llm",
+    "OpenRouterModel": ".llm",
     # 适配器
-    "AGUIAdapter",
-    "Task",
+    "AGUIAdapter": ".adapter",
+    "Task": ".adapter",
     # 持久化
-    "DatabaseConfig",
-    "TORTOISE_ORM_CONFIG_TEMPLATE",
-    "TortoiseRepository",
-    "ConversationRepository",
-    "PostgresCheckpoint",
-    "AgentConversation",
-    "AgentMessage",
+    "DatabaseConfig": ".persistence",
+    "TORTOISE_ORM_CONFIG_TEMPLATE": ".persistence",
+    "init_database": ".persistence",
+    "close_database": ".persistence",
+    "TortoiseRepository": ".persistence",
+    "ConversationRepository": ".persistence",
+    "MessageRepository": ".persistence",
+    "PostgresCheckpoint": ".persistence",
+    "AgentConversation": ".persistence",
+    "AgentMessage": ".persistence",
     # 日志系统
-    "logger",
-    "get_logger",
-    "configure_logging",
-    "LoggerConfigurator",
-    "LogPathStrategy",
-]
+    "logger": ".core.logger_config",
+    "get_logger": ".core.logger_config",
+    "configure_logging": ".core.logger_config",
+    "LoggerConfigurator": ".core.logger_config",
+    "LogPathStrategy": ".core.logger_config",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    # 缓存到模块全局，后续访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .adapter import AGUIAdapter, Task
+    from .core.logger_config import (
+        LoggerConfigurator,
+        LogPathStrategy,
+        configure_logging,
+        get_logger,
+        logger,
+    )
+    from .llm import (
+        AnthropicModel,
+        BaseChatModel,
+        DoubaoModel,
+        LLMConfig,
+        LLMFactory,
+        LLMProvider,
+        OpenAIModel,
+        OpenRouterModel,
+        TongyiModel,
+        ZhipuModel,
+        get_llm_factory,
+        llm_factory,
+    )
+    from .persistence import (
+        TORTOISE_ORM_CONFIG_TEMPLATE,
+        AgentConversation,
+        AgentMessage,
+        ConversationRepository,
+        DatabaseConfig,
+        MessageRepository,
+        PostgresCheckpoint,
+        TortoiseRepository,
+        close_database,
+        init_database,
+    )
@@ -4,9 +4,10 @@ AG-UI 协议适配器
 将任何 LangChain Runnable 的事件流转换为 AG-UI 标准事件流
 """
 
-import json
+import asyncio
 import logging
-from typing import AsyncGenerator
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, Optional
 
 # 核心依赖 - 直接导入
 from ag_ui.core.events import (
@@ -15,19 +16,185 @@ from ag_ui.core.events import (
     RunErrorEvent,
     RunFinishedEvent,
     RunStartedEvent,
+    TextMessageChunkEvent,
 )
 from ag_ui.encoder import EventEncoder
 from langchain_core.runnables import Runnable
 
 from .errors import EventTranslationError
-from .event_translator import EventTranslator
+from .event_translator import EventTranslator, acquire_translator, release_translator
 from .models import Task
+from .tool_call_tracker import ToolCallTracker
 
 # 设置日志
 logger = logging.getLogger(__name__)
 
 # 配置常量
 SSE_PING_INTERVAL = 15  # SSE心跳间隔（秒）
+STREAM_QUEUE_SIZE = 64  # 上游事件与下游发送之间的缓冲事件数
+AGENT_STREAM_TIMEOUT = 300  # 单次运行的总时长上限（秒）
+INTER_EVENT_TIMEOUT = 60  # 相邻两个上游事件之间的最长等待时间（秒）
+SSE_COALESCE_WINDOW = 0.005  # 合并 SSE 帧后一次写出的最长等待时间（秒），为 0 时逐帧写出
+SSE_COALESCE_BYTES = 4096  # 缓冲的 SSE 帧达到该字节数时立即写出
+
+# 生产者正常结束的哨兵
+_STREAM_END = object()
+
+# 运行边界事件不等待合并，客户端能立即感知运行开始与结束
+_UNBUFFERED_EVENT_TYPES = frozenset(
+    (EventType.RUN_STARTED, EventType.RUN_FINISHED, EventType.RUN_ERROR)
+)
+
+
+def _is_mergeable_chunk(event) -> bool:
+    """是否为可与相邻块合并的纯文本增量事件"""
+    return (
+        type(event) is TextMessageChunkEvent
+        and type(event.delta) is str
+        and event.message_id is None
+    )
+
+
+def _log_event(event: BaseEvent, level: int = logging.DEBUG) -> None:
+    """
+    记录即将发送的事件
+
+    每个 token 都会经过这里：先检查日志级别，仅在会真正输出时才调用 model_dump()。
+    """
+    if logger.isEnabledFor(level):
+        logger.log(
+            level,
+            "Sending event",
+            extra={"event_type": event.type, "event_data": event.model_dump()},
+        )
+
+
+def _text_frame(chunks) -> bytes:
+    """把连续的文本块编码为一帧；多于一块时合并 delta"""
+    if len(chunks) == 1:
+        return _sse_frame(chunks[0])
+    merged = TextMessageChunkEvent.model_construct(
+        type=EventType.TEXT_MESSAGE_CHUNK, delta="".join(chunk.delta for chunk in chunks)
+    )
+    return _sse_frame(merged)
+
+
+def _sse_frame(event: BaseEvent) -> bytes:
+    """
+    把事件编码为完整的 SSE data 帧
+
+    pydantic-core 直接输出 JSON 字节（紧凑格式，不含换行），
+    省去中间 dict、str 以及 sse_starlette 再次 encode 的开销；
+    EventSourceResponse 对 bytes 原样写出。
+    """
+    return b"data: " + event.__pydantic_serializer__.to_json(event) + b"\n\n"
+
+
+async def _coalesce_frames(
+    events: AsyncGenerator[BaseEvent, None],
+    window: float = SSE_COALESCE_WINDOW,
+    max_bytes: int = SSE_COALESCE_BYTES,
+) -> AsyncGenerator[bytes, None]:
+    """
+    把连续的 SSE 帧合并后再写出，减少逐 token 的帧数与小块写入
+
+    缓冲区在首个事件进入后最多保留 window 秒或累计 max_bytes 字节；
+    其间连续到达的纯文本块合并为一个 TextMessageChunkEvent 帧。
+    上游空闲时按时写出已缓冲的帧，运行边界事件连同缓冲区立即写出。
+    window 为 0 时逐帧写出、不做合并。
+    """
+    if window <= 0:
+        async for event in events:
+            yield _sse_frame(event)
+        return
+
+    loop = asyncio.get_running_loop()
+    buffer = []
+    # 缓冲区末尾尚未编码的连续文本块
+    text_chunks = []
+    size = 0
+    deadline = 0.0
+    pending = None
+
+    def seal_text() -> None:
+        if text_chunks:
+            buffer.append(_text_frame(text_chunks))
+            text_chunks.clear()
+
+    def drain() -> bytes:
+        nonlocal size
+        seal_text()
+        data = b"".join(buffer)
+        buffer.clear()
+        size = 0
+        return data
+
+    try:
+        while True:
+            if pending is None and not buffer and not text_chunks:
+                # 缓冲区为空时没有需要按时写出的数据，直接等待下一个事件
+                try:
+                    event = await events.__anext__()
+                except StopAsyncIteration:
+                    break
+                deadline = loop.time() + window
+            else:
+                # 等待下一个事件但不取消它：超时只写出缓冲区，随后继续等待同一个事件
+                if pending is None:
+                    pending = asyncio.ensure_future(events.__anext__())
+                if buffer or text_chunks:
+                    remaining = deadline - loop.time()
+                    if remaining > 0:
+                        await asyncio.wait((pending,), timeout=remaining)
+                    if not pending.done():
+                        yield drain()
+                        continue
+                task, pending = pending, None
+                try:
+                    event = await task
+                except StopAsyncIteration:
+                    break
+                if not buffer and not text_chunks:
+                    deadline = loop.time() + window
+
+            if _is_mergeable_chunk(event):
+                text_chunks.append(event)
+                size += len(event.delta)
+            else:
+                seal_text()
+                frame = _sse_frame(event)
+                buffer.append(frame)
+                size += len(frame)
+            if size >= max_bytes or event.type in _UNBUFFERED_EVENT_TYPES:
+                yield drain()
+
+        if buffer or text_chunks:
+            yield drain()
+    finally:
+        # 客户端断开时先结束进行中的读取，再关闭上游，使其 finally 得以执行
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await events.aclose()
+
+
+@lru_cache(maxsize=1)
+def _ping_message():
+    """SSE 心跳消息，进程内只构造一次，所有连接共享"""
+    from sse_starlette.sse import ServerSentEvent
+
+    return ServerSentEvent(comment="ping")
+
+
+@lru_cache(maxsize=8)
+def _get_encoder(accept: Optional[str]) -> EventEncoder:
+    """
+    按 Accept 头复用 EventEncoder
+
+    EventEncoder 只保存 accept 值、编码过程无状态，
+    而 Accept 头的取值种类很少，缓存后无需每个请求重新创建。
+    """
+    return EventEncoder(accept=accept)
 
 
 class AGUIAdapter:
@@ -43,8 +210,17 @@ class AGUIAdapter:
     统一使用 astream_events 接口，自动适配不同的输入格式。
     """
 
-    def __init__(self, agent: Runnable):
+    __slots__ = ("agent", "coalesce_window")
+
+    def __init__(self, agent: Runnable, coalesce_window: float = SSE_COALESCE_WINDOW):
+        """
+        Args:
+            agent: 任意 LangChain Runnable
+            coalesce_window: FastAPI 端点合并 SSE 帧（含连续文本块）的时间窗口（秒），
+                为 0 时逐帧写出
+        """
         self.agent = agent
+        self.coalesce_window = coalesce_window
 
     async def stream_events(self, task: Task) -> AsyncGenerator[BaseEvent, None]:
         """
@@ -57,8 +233,8 @@ class AGUIAdapter:
         Yields:
             AG-UI 事件 Pydantic 对象
         """
-        # 初始化事件翻译器（带独立状态）
-        event_translator = EventTranslator()
+        # 从池中获取事件翻译器（带独立状态），流结束后归还
+        event_translator = acquire_translator()
 
         try:
             # 步骤 1: 正确处理thread_id和run_id的关系
@@ -67,11 +243,13 @@ class AGUIAdapter:
 
             logger.info(
                 "Starting event stream for task",
-                task_id=task.id,
-                query=task.query,
-                thread_id=task.thread_id,
-                effective_thread_id=effective_thread_id,
-                agent_type=type(self.agent).__name__,
+                extra={
+                    "task_id": task.id,
+                    "query": task.query,
+                    "thread_id": task.thread_id,
+                    "effective_thread_id": effective_thread_id,
+                    "agent_type": type(self.agent).__name__,
+                },
             )
 
             # 步骤 2: 产生 AG-UI 的 "开始" 事件
@@ -80,35 +258,27 @@ class AGUIAdapter:
                 thread_id=effective_thread_id,  # 正确的对话线程ID
                 run_id=task.id,  # 每次运行的唯一标识
             )
-            logger.info(
-                "Sending event",
-                event_type=run_started.type,
-                event_data=run_started.model_dump(),
-            )
+            _log_event(run_started)
             yield run_started
 
-            # 统一使用 astream_events，直接传字符串即可
-            logger.info("Using unified astream_events interface")
-
-            async for event in self.agent.astream_events(task.query, version="v2"):
-                try:
-                    async for ag_ui_event in event_translator.translate_event(event):
-                        logger.info(
-                            "Sending event",
-                            event_type=ag_ui_event.type,
-                            event_data=ag_ui_event.model_dump(),
-                        )
-                        yield ag_ui_event
-                except EventTranslationError as e:
-                    logger.warning(f"Failed to translate event: {e}")
-                    continue
-                except Exception as e:
-                    logger.exception(
-                        "Unexpected error translating event",
-                        error_type=type(e).__name__,
-                        error_message=str(e),
-                    )
-                    continue
+            # 步骤 3: 后台任务持续拉取并翻译上游事件，经有界队列交给当前协程发送，
+            # 使 LLM 推理与编码/网络写出重叠，队列满时自然形成背压
+            queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+            producer = asyncio.create_task(self._pump_events(task, event_translator, queue))
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is _STREAM_END:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+
+                    _log_event(item)
+                    yield item
+            finally:
+                if not producer.done():
+                    producer.cancel()
+                    await asyncio.gather(producer, return_exceptions=True)
 
             # 步骤 4: 产生 AG-UI 的 "完成" 事件
             run_finished = RunFinishedEvent(
@@ -116,35 +286,111 @@ class AGUIAdapter:
                 thread_id=effective_thread_id,  # 使用相同的线程ID
                 run_id=task.id,  # 使用正确的运行ID
             )
-            logger.info(
-                "Sending event",
-                event_type=run_finished.type,
-                event_data=run_finished.model_dump(),
-            )
+            _log_event(run_finished)
             yield run_finished
 
             logger.info(
                 "AG-UI streaming completed successfully",
-                task_id=task.id,
-                thread_id=effective_thread_id,
+                extra={"task_id": task.id, "thread_id": effective_thread_id},
             )
 
         except Exception as e:
             logger.exception(
                 "AGUIAdapter error",
-                task_id=task.id,
-                error_type=type(e).__name__,
-                error_message=str(e),
+                extra={
+                    "task_id": task.id,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                },
             )
             # 步骤 5: 错误处理
             run_error = RunErrorEvent(type=EventType.RUN_ERROR, message=str(e))
-            logger.info(
-                "Sending event",
-                event_type=run_error.type,
-                event_data=run_error.model_dump(),
-            )
+            _log_event(run_error)
             yield run_error
 
+        finally:
+            release_translator(event_translator)
+
+    async def _translate_event(
+        self, event: Dict[str, Any], tool_tracker: ToolCallTracker
+    ) -> AsyncGenerator[BaseEvent, None]:
+        """
+        使用指定的工具调用跟踪器翻译单个事件
+
+        分发由 EventTranslator 的处理方法表完成（一次字典查找），
+        此处只绑定调用方提供的跟踪器，使多次调用之间共享工具调用状态。
+
+        Args:
+            event: LangChain/LangGraph 事件字典
+            tool_tracker: 工具调用跟踪器
+
+        Yields:
+            AG-UI 事件对象
+        """
+        for ag_ui_event in EventTranslator(tool_tracker).translate(event):
+            yield ag_ui_event
+
+    async def _pump_events(
+        self, task: Task, event_translator: EventTranslator, queue: asyncio.Queue
+    ) -> None:
+        """
+        生产者：拉取 agent 事件并翻译后放入队列
+
+        正常结束时放入 _STREAM_END；上游抛出的异常（包括超时）作为队列元素交给消费者重新抛出。
+        """
+        # 统一使用 astream_events，直接传字符串即可
+        logger.info("Using unified astream_events interface")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + AGENT_STREAM_TIMEOUT
+        events = None
+
+        try:
+            events = self.agent.astream_events(task.query, version="v2").__aiter__()
+            while True:
+                # 同时受总时长与事件间隔约束，上游卡住时不会无限占用连接
+                remaining = deadline - loop.time()
+                if remaining < INTER_EVENT_TIMEOUT:
+                    wait, reason = remaining, f"Agent stream exceeded {AGENT_STREAM_TIMEOUT}s"
+                else:
+                    wait, reason = INTER_EVENT_TIMEOUT, f"No agent event received for {INTER_EVENT_TIMEOUT}s"
+                try:
+                    if wait <= 0:
+                        raise asyncio.TimeoutError
+                    event = await asyncio.wait_for(events.__anext__(), wait)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    raise asyncio.TimeoutError(reason) from None
+
+                try:
+                    for ag_ui_event in event_translator.translate(event):
+                        await queue.put(ag_ui_event)
+                except EventTranslationError as e:
+                    logger.warning(f"Failed to translate event: {e}")
+                    continue
+                except Exception as e:
+                    logger.exception(
+                        "Unexpected error translating event",
+                        extra={
+                            "error_type": type(e).__name__,
+                            "error_message": str(e),
+                        },
+                    )
+                    continue
+        except Exception as e:
+            await queue.put(e)
+            return
+        finally:
+            # 超时或取消时及时关闭上游生成器，释放其持有的连接
+            aclose = getattr(events, "aclose", None) if events is not None else None
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception:
+                    pass
+
+        await queue.put(_STREAM_END)
+
     async def create_official_stream(self, task: Task, accept_header: str = None):
         """
         创建官方 AG-UI 格式的事件流
@@ -157,14 +403,16 @@ class AGUIAdapter:
         Yields:
             编码后的 SSE 事件数据
         """
-        # 创建 AG-UI 官方的事件编码器
-        encoder = EventEncoder(accept=accept_header)
+        # 获取 AG-UI 官方的事件编码器（按 Accept 头缓存）
+        encoder = _get_encoder(accept_header)
 
         logger.info(
             "Creating official AG-UI stream",
-            task_id=task.id,
-            thread_id=task.thread_id,
-            accept_header=accept_header,
+            extra={
+                "task_id": task.id,
+                "thread_id": task.thread_id,
+                "accept_header": accept_header,
+            },
         )
 
         try:
@@ -176,9 +424,11 @@ class AGUIAdapter:
         except Exception as e:
             logger.exception(
                 "Error in official stream creation",
-                task_id=task.id,
-                error_type=type(e).__name__,
-                error_message=str(e),
+                extra={
+                    "task_id": task.id,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                },
             )
             # 发送错误事件，使用官方编码器
             error_event = RunErrorEvent(type="RUN_ERROR", message=str(e))
@@ -197,13 +447,10 @@ class AGUIAdapter:
             """
             from sse_starlette.sse import EventSourceResponse
 
-            async def json_stream():
-                async for event_obj in self.stream_events(task):
-                    yield json.dumps(event_obj.model_dump())
-
             return EventSourceResponse(
-                json_stream(),
+                _coalesce_frames(self.stream_events(task), self.coalesce_window),
                 ping=SSE_PING_INTERVAL,  # 心跳间隔
+                ping_message_factory=_ping_message,
                 media_type="text/event-stream",
             )
 
@@ -6,8 +6,10 @@
 
 import json
 import logging
-from typing import AsyncGenerator, Dict, Any
+from collections import deque
+from typing import Any, AsyncGenerator, Deque, Dict, Iterable, Iterator, List, Optional
 
+import orjson
 from ag_ui.core.events import (
     BaseEvent,
     CustomEvent,
@@ -24,11 +26,45 @@ from ag_ui.core.events import (
 )
 
 from ..core.events import _INTERNAL_EVENT_MARKER
-from .langgraph_events import LangGraphEventType
+from .langgraph_events import (
+    KNOWN_EVENTS,
+    ON_CHAIN_END,
+    ON_CHAIN_START,
+    ON_CHAT_MODEL_STREAM,
+    ON_CUSTOM_EVENT,
+    ON_NODE_END,
+    ON_NODE_START,
+    ON_TOOL_END,
+    ON_TOOL_START,
+)
 from .tool_call_tracker import ToolCallTracker
 
 logger = logging.getLogger(__name__)
 
+# 预先解析的 AG-UI 事件类型，热路径上无需每次访问 EventType 枚举属性
+_TOOL_CALL_START = EventType.TOOL_CALL_START
+_TOOL_CALL_ARGS = EventType.TOOL_CALL_ARGS
+_TOOL_CALL_END = EventType.TOOL_CALL_END
+_TOOL_CALL_RESULT = EventType.TOOL_CALL_RESULT
+_TEXT_MESSAGE_CHUNK = EventType.TEXT_MESSAGE_CHUNK
+_THINKING_TEXT_MESSAGE_START = EventType.THINKING_TEXT_MESSAGE_START
+_THINKING_TEXT_MESSAGE_END = EventType.THINKING_TEXT_MESSAGE_END
+_STEP_STARTED = EventType.STEP_STARTED
+_STEP_FINISHED = EventType.STEP_FINISHED
+
+
+def _dumps(value: Any) -> str:
+    """
+    序列化工具的输入/输出
+
+    orjson 负责常见情况（非字符串键按 OPT_NON_STR_KEYS 转为字符串）；
+    orjson 无法处理的值（如超出 64 位的整数）回退到标准库 json，行为与原实现一致。
+    """
+    try:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        return json.dumps(value, ensure_ascii=False)
+
 
 class EventTranslator:
     """
@@ -36,8 +72,18 @@ class EventTranslator:
     将 LangChain/LangGraph 事件转换为 AG-UI 标准事件
     """
 
-    def __init__(self):
-        self.tool_tracker = ToolCallTracker()
+    __slots__ = ("tool_tracker",)
+
+    def __init__(self, tool_tracker: Optional[ToolCallTracker] = None):
+        """
+        Args:
+            tool_tracker: 共享的工具调用跟踪器，默认新建
+        """
+        self.tool_tracker = tool_tracker if tool_tracker is not None else ToolCallTracker()
+
+    def reset(self) -> None:
+        """清空翻译状态，便于实例复用"""
+        self.tool_tracker.clear()
 
     async def translate_event(self, event: Dict[str, Any]) -> AsyncGenerator[BaseEvent, None]:
         """
@@ -49,67 +95,40 @@ class EventTranslator:
         Yields:
             AG-UI 事件对象
         """
-        kind_str = event["event"]
-
-        # 使用强类型枚举转换
-        try:
-            kind = LangGraphEventType(kind_str)
-        except ValueError:
-            # 宽容处理未知事件类型
-            event_data_str = str(event.get("data", {}))
-            truncated_data = (
-                event_data_str[:100] + "..."
-                if len(event_data_str) > 100
-                else event_data_str
-            )
-            logger.warning(f"Unknown event type: {kind_str}, data: {truncated_data}")
-            return
-
-        event_data = event.get("data", {})
-
-        # 工具调用开始事件
-        if kind is LangGraphEventType.ON_TOOL_START:
-            async for ag_event in self._handle_tool_start(event, event_data):
-                yield ag_event
-
-        # 工具调用结束事件
-        elif kind is LangGraphEventType.ON_TOOL_END:
-            async for ag_event in self._handle_tool_end(event, event_data):
-                yield ag_event
+        for ag_event in self._iter_translated(event):
+            yield ag_event
 
-        # LLM流式输出事件
-        elif kind is LangGraphEventType.ON_CHAT_MODEL_STREAM:
-            async for ag_event in self._handle_chat_model_stream(event_data):
-                yield ag_event
-
-        # 思考开始事件
-        elif kind is LangGraphEventType.ON_CHAIN_START:
-            yield ThinkingTextMessageStartEvent(
-                type=EventType.THINKING_TEXT_MESSAGE_START
-            )
-
-        # 思考结束事件
-        elif kind is LangGraphEventType.ON_CHAIN_END:
-            yield ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END)
-
-        # 步骤开始事件
-        elif kind is LangGraphEventType.ON_NODE_START:
-            node_name = event.get("name", "Unknown")
-            yield StepStartedEvent(type=EventType.STEP_STARTED, name=node_name)
+    def translate(self, event: Dict[str, Any]) -> List[BaseEvent]:
+        """
+        同步翻译单个事件，返回 AG-UI 事件列表
 
-        # 步骤结束事件
-        elif kind is LangGraphEventType.ON_NODE_END:
-            node_name = event.get("name", "Unknown")
-            yield StepFinishedEvent(type=EventType.STEP_FINISHED, name=node_name)
+        各处理方法均为普通生成器，不经过异步生成器的协程开销。
+        """
+        return list(self._iter_translated(event))
 
-        # 自定义事件处理
-        elif kind is LangGraphEventType.ON_CUSTOM_EVENT:
-            async for ag_event in self._handle_custom_event(event, event_data):
-                yield ag_event
+    def _iter_translated(self, event: Dict[str, Any]) -> Iterable[BaseEvent]:
+        """查找处理方法并返回其生成器；无需翻译的事件返回空元组"""
+        kind_str = event["event"]
 
-    async def _handle_tool_start(
+        # 单次字典查找完成分发，避免每个事件都走 Enum 构造和异常控制流
+        handler = self._DISPATCH.get(kind_str)
+        if handler is None:
+            if kind_str not in KNOWN_EVENTS:
+                # 宽容处理未知事件类型
+                event_data_str = str(event.get("data", {}))
+                truncated_data = (
+                    event_data_str[:100] + "..."
+                    if len(event_data_str) > 100
+                    else event_data_str
+                )
+                logger.warning(f"Unknown event type: {kind_str}, data: {truncated_data}")
+            return ()
+
+        return handler(self, event, event.get("data", {}))
+
+    def _handle_tool_start(
         self, event: Dict[str, Any], event_data: Dict[str, Any]
-    ) -> AsyncGenerator[BaseEvent, None]:
+    ) -> Iterator[BaseEvent]:
         """处理工具调用开始事件"""
         # 工具名称在事件的顶层name字段中，不在data中
         tool_name = event.get("name", "unknown")
@@ -118,23 +137,24 @@ class EventTranslator:
         # 生成并保存call_id
         call_id = self.tool_tracker.start_call(tool_name)
 
+        # 以下事件的字段均由本模块生成、类型确定，使用 model_construct 跳过校验
         # 发送ToolCallStartEvent
-        yield ToolCallStartEvent(
-            type=EventType.TOOL_CALL_START,
+        yield ToolCallStartEvent.model_construct(
+            type=_TOOL_CALL_START,
             tool_call_id=call_id,
             tool_call_name=tool_name,
         )
 
         # 发送ToolCallArgsEvent
-        yield ToolCallArgsEvent(
-            type=EventType.TOOL_CALL_ARGS,
+        yield ToolCallArgsEvent.model_construct(
+            type=_TOOL_CALL_ARGS,
             tool_call_id=call_id,
-            delta=json.dumps(tool_input, ensure_ascii=False),
+            delta=_dumps(tool_input),
         )
 
-    async def _handle_tool_end(
+    def _handle_tool_end(
         self, event: Dict[str, Any], event_data: Dict[str, Any]
-    ) -> AsyncGenerator[BaseEvent, None]:
+    ) -> Iterator[BaseEvent]:
         """处理工具调用结束事件"""
         # 工具名称在事件的顶层name字段中，不在data中
         tool_name = event.get("name", "unknown")
@@ -147,35 +167,43 @@ class EventTranslator:
             return
 
         # 发送ToolCallEndEvent
-        yield ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id=call_id)
+        yield ToolCallEndEvent.model_construct(type=_TOOL_CALL_END, tool_call_id=call_id)
 
         # 发送ToolCallResultEvent
         result_content = (
-            json.dumps(tool_output, ensure_ascii=False)
+            _dumps(tool_output)
             if tool_output is not None
             else ""
         )
-        yield ToolCallResultEvent(
-            type=EventType.TOOL_CALL_RESULT,
+        yield ToolCallResultEvent.model_construct(
+            type=_TOOL_CALL_RESULT,
             message_id=call_id,  # 使用call_id作为message_id
             tool_call_id=call_id,
             content=result_content,
         )
 
-    async def _handle_chat_model_stream(
-        self, event_data: Dict[str, Any]
-    ) -> AsyncGenerator[BaseEvent, None]:
+    def _handle_chat_model_stream(
+        self, event: Dict[str, Any], event_data: Dict[str, Any]
+    ) -> Iterator[BaseEvent]:
         """处理聊天模型流式事件"""
         chunk = event_data.get("chunk")
-        if chunk and hasattr(chunk, "content") and chunk.content:
+        # 单次 getattr 取内容；仅含元数据或工具调用增量的空块直接跳过，不构造事件
+        content = getattr(chunk, "content", None) if chunk is not None else None
+        if not content:
+            return
+        # 每个 token 一次的热路径：字符串内容直接构造，其余类型（如内容块列表）仍走校验
+        if type(content) is str:
+            yield TextMessageChunkEvent.model_construct(
+                type=_TEXT_MESSAGE_CHUNK, delta=content
+            )
+        else:
             yield TextMessageChunkEvent(
-                type=EventType.TEXT_MESSAGE_CHUNK,
-                delta=chunk.content,
+                type=_TEXT_MESSAGE_CHUNK, delta=content
             )
 
-    async def _handle_custom_event(
+    def _handle_custom_event(
         self, event: Dict[str, Any], event_data: Dict[str, Any]
-    ) -> AsyncGenerator[BaseEvent, None]:
+    ) -> Iterator[BaseEvent]:
         """处理自定义事件"""
         # 只处理我们约定的、由EventEmitter发出的内部标记事件
         if event.get("name") == _INTERNAL_EVENT_MARKER:
@@ -188,6 +216,64 @@ class EventTranslator:
                 type=EventType.CUSTOM, name=ui_event_name, value=ui_event_payload
             )
 
+    def _handle_chain_start(
+        self, event: Dict[str, Any], event_data: Dict[str, Any]
+    ) -> Iterator[BaseEvent]:
+        """处理思考开始事件"""
+        yield ThinkingTextMessageStartEvent.model_construct(type=_THINKING_TEXT_MESSAGE_START)
+
+    def _handle_chain_end(
+        self, event: Dict[str, Any], event_data: Dict[str, Any]
+    ) -> Iterator[BaseEvent]:
+        """处理思考结束事件"""
+        yield ThinkingTextMessageEndEvent.model_construct(type=_THINKING_TEXT_MESSAGE_END)
+
+    def _handle_node_start(
+        self, event: Dict[str, Any], event_data: Dict[str, Any]
+    ) -> Iterator[BaseEvent]:
+        """处理步骤开始事件"""
+        node_name = event.get("name", "Unknown")
+        yield StepStartedEvent.model_construct(type=_STEP_STARTED, name=node_name)
+
+    def _handle_node_end(
+        self, event: Dict[str, Any], event_data: Dict[str, Any]
+    ) -> Iterator[BaseEvent]:
+        """处理步骤结束事件"""
+        node_name = event.get("name", "Unknown")
+        yield StepFinishedEvent.model_construct(type=_STEP_FINISHED, name=node_name)
+
+    # 事件类型 -> 处理方法的分发表，类定义时构建一次
+    # 键为 sys.intern 驻留的常量：上游事件名同为驻留字面量时，字典查找只需比较指针
+    _DISPATCH = {
+        ON_TOOL_START: _handle_tool_start,
+        ON_TOOL_END: _handle_tool_end,
+        ON_CHAT_MODEL_STREAM: _handle_chat_model_stream,
+        ON_CHAIN_START: _handle_chain_start,
+        ON_CHAIN_END: _handle_chain_end,
+        ON_NODE_START: _handle_node_start,
+        ON_NODE_END: _handle_node_end,
+        ON_CUSTOM_EVENT: _handle_custom_event,
+    }
+
+
+# 空闲翻译器池，避免每个流都新建 EventTranslator 和 ToolCallTracker
+TRANSLATOR_POOL_SIZE = 128
+_translator_pool: Deque[EventTranslator] = deque(maxlen=TRANSLATOR_POOL_SIZE)
+
+
+def acquire_translator() -> EventTranslator:
+    """从池中取出一个状态已清空的翻译器，池空时新建"""
+    try:
+        return _translator_pool.pop()
+    except IndexError:
+        return EventTranslator()
+
+
+def release_translator(translator: EventTranslator) -> None:
+    """清空状态后归还翻译器；池满时由 deque 自动丢弃最旧的实例"""
+    translator.reset()
+    _translator_pool.append(translator)
+
 
 # 默认翻译器实例（保持向后兼容）
 default_translator = EventTranslator()
\ No newline at end of file
@@ -1,44 +1,100 @@
 # -*- coding: utf-8 -*-
 """
-LangGraph事件类型枚举定义
-用于消除魔术字符串，提供强类型支持
+LangGraph事件类型常量定义
+用于消除魔术字符串
+
+热路径上直接使用模块级字符串常量（均经 sys.intern 驻留），
+LangGraphEventType 枚举保留用于向后兼容。
 """
 
+import sys
 from enum import Enum
 
+# 工具相关事件
+ON_TOOL_START = sys.intern("on_tool_start")
+ON_TOOL_END = sys.intern("on_tool_end")
+
+# 聊天模型事件
+ON_CHAT_MODEL_START = sys.intern("on_chat_model_start")
+ON_CHAT_MODEL_STREAM = sys.intern("on_chat_model_stream")
+ON_CHAT_MODEL_END = sys.intern("on_chat_model_end")
+
+# 链执行事件
+ON_CHAIN_START = sys.intern("on_chain_start")
+ON_CHAIN_STREAM = sys.intern("on_chain_stream")
+ON_CHAIN_END = sys.intern("on_chain_end")
+
+# 节点执行事件
+ON_NODE_START = sys.intern("on_node_start")
+ON_NODE_END = sys.intern("on_node_end")
+
+# 自定义事件
+ON_CUSTOM_EVENT = sys.intern("on_custom_event")
+
+# LLM相关事件
+ON_LLM_START = sys.intern("on_llm_start")
+ON_LLM_STREAM = sys.intern("on_llm_stream")
+ON_LLM_END = sys.intern("on_llm_end")
+
+# 检索器事件
+ON_RETRIEVER_START = sys.intern("on_retriever_start")
+ON_RETRIEVER_END = sys.intern("on_retriever_end")
+
+# 所有已知的事件类型（包括无需翻译的类型）
+KNOWN_EVENTS = frozenset(
+    {
+        ON_TOOL_START,
+        ON_TOOL_END,
+        ON_CHAT_MODEL_START,
+        ON_CHAT_MODEL_STREAM,
+        ON_CHAT_MODEL_END,
+        ON_CHAIN_START,
+        ON_CHAIN_STREAM,
+        ON_CHAIN_END,
+        ON_NODE_START,
+        ON_NODE_END,
+        ON_CUSTOM_EVENT,
+        ON_LLM_START,
+        ON_LLM_STREAM,
+        ON_LLM_END,
+        ON_RETRIEVER_START,
+        ON_RETRIEVER_END,
+    }
+)
+
 
 class LangGraphEventType(str, Enum):
     """
     LangGraph流式事件类型枚举
-    提供强类型支持，避免在适配器逻辑中使用魔术字符串
+    提供强类型支持，取值与上面的模块级常量一一对应
     """
 
     # 工具相关事件
-    ON_TOOL_START = "on_tool_start"
-    ON_TOOL_END = "on_tool_end"
+    ON_TOOL_START = ON_TOOL_START
+    ON_TOOL_END = ON_TOOL_END
 
     # 聊天模型事件
-    ON_CHAT_MODEL_START = "on_chat_model_start"
-    ON_CHAT_MODEL_STREAM = "on_chat_model_stream"
-    ON_CHAT_MODEL_END = "on_chat_model_end"
+    ON_CHAT_MODEL_START = ON_CHAT_MODEL_START
+    ON_CHAT_MODEL_STREAM = ON_CHAT_MODEL_STREAM
+    ON_CHAT_MODEL_END = ON_CHAT_MODEL_END
 
     # 链执行事件
-    ON_CHAIN_START = "on_chain_start"
-    ON_CHAIN_STREAM = "on_chain_stream"
-    ON_CHAIN_END = "on_chain_end"
+    ON_CHAIN_START = ON_CHAIN_START
+    ON_CHAIN_STREAM = ON_CHAIN_STREAM
+    ON_CHAIN_END = ON_CHAIN_END
 
     # 节点执行事件
-    ON_NODE_START = "on_node_start"
-    ON_NODE_END = "on_node_end"
+    ON_NODE_START = ON_NODE_START
+    ON_NODE_END = ON_NODE_END
 
     # 自定义事件
-    ON_CUSTOM_EVENT = "on_custom_event"
+    ON_CUSTOM_EVENT = ON_CUSTOM_EVENT
 
     # LLM相关事件
-    ON_LLM_START = "on_llm_start"
-    ON_LLM_STREAM = "on_llm_stream"
-    ON_LLM_END = "on_llm_end"
+    ON_LLM_START = ON_LLM_START
+    ON_LLM_STREAM = ON_LLM_STREAM
+    ON_LLM_END = ON_LLM_END
 
     # 检索器事件
-    ON_RETRIEVER_START = "on_retriever_start"
-    ON_RETRIEVER_END = "on_retriever_end"
+    ON_RETRIEVER_START = ON_RETRIEVER_START
+    ON_RETRIEVER_END = ON_RETRIEVER_END
@@ -4,9 +4,36 @@
 管理当前活跃的工具调用ID，用于在start、args、end、result事件之间建立关联
 """
 
-import uuid
+import itertools
+import os
+import secrets
 from typing import Dict, Optional
 
+# call_id = 8 位进程随机前缀 + 24 位十六进制递增序号，与 uuid4().hex 同为 32 个字符；
+# 生成时只需一次 next()，不再读取系统熵源
+_ID_PREFIX_BYTES = 4
+_ID_COUNTER_WIDTH = 24
+
+_id_prefix = secrets.token_hex(_ID_PREFIX_BYTES)
+# itertools.count 的 next() 在 GIL 下是原子的，可跨线程共享
+_id_counter = itertools.count(1)
+
+
+def _reseed_call_ids() -> None:
+    """重新生成前缀与计数器；fork 出的子进程各自使用独立前缀，避免多 worker 间 ID 重复"""
+    global _id_prefix, _id_counter
+    _id_prefix = secrets.token_hex(_ID_PREFIX_BYTES)
+    _id_counter = itertools.count(1)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_call_ids)
+
+
+def _next_call_id() -> str:
+    """生成进程内唯一的 call_id"""
+    return f"{_id_prefix}{next(_id_counter):0{_ID_COUNTER_WIDTH}x}"
+
 
 class ToolCallTracker:
     """
@@ -14,12 +41,14 @@ class ToolCallTracker:
     管理当前活跃的工具调用ID，用于在start、args、end、result事件之间建立关联
     """
 
+    __slots__ = ("active_calls",)
+
     def __init__(self):
         self.active_calls: Dict[str, str] = {}  # tool_name -> call_id
 
     def start_call(self, tool_name: str) -> str:
         """开始一次工具调用，返回生成的call_id"""
-        call_id = uuid.uuid4().hex
+        call_id = _next_call_id()
         self.active_calls[tool_name] = call_id
         return call_id
 
@@ -29,4 +58,8 @@ class ToolCallTracker:
 
     def get_call_id(self, tool_name: str) -> Optional[str]:
         """获取当前工具的call_id"""
-        return self.active_calls.get(tool_name)
\ No newline at end of file
+        return self.active_calls.get(tool_name)
+
+    def clear(self) -> None:
+        """清空所有活跃调用，便于实例复用"""
+        self.active_calls.clear()
\ No newline at end of file
@@ -26,13 +26,280 @@ Usage:
     # 带上下文的日志
     logger = get_logger(contextual=True)
     logger.with_trace_id("abc123").info("Processing request")
+
+    # 请求作用域内的标识（基于 contextvars，不创建新的 logger 对象）
+    with log_context(trace_id="abc123", request_id="req-1"):
+        logger.info("Processing request")
+
+    # 异常变量诊断（diagnose）默认关闭：它会为每条带异常的记录展开各帧的变量值，
+    # 开销较大且可能把敏感数据写入日志。排查问题时可显式开启：
+    LoggerConfigurator().configure_console(diagnose=True)
 """
 
+import atexit
 import os
+import random
 import sys
+import threading
+import time
+import traceback
+import zlib
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
-from loguru import logger as _logger
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional, Callable, Dict, Any, Iterator, List, TextIO, Tuple
+
+import orjson
+from loguru import logger as _base_logger
+
+# 请求级标识保存在 contextvars 中，由 patcher 在记录生成时写入 extra，
+# 进入请求作用域只需一次 ContextVar.set，无需为每个请求 bind 新的 logger
+_TRACE_ID: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+_REQUEST_ID: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_USER_ID: ContextVar[Optional[str]] = ContextVar("user_id", default=None)
+_CONTEXT_ID_VARS = (
+    ("trace_id", _TRACE_ID),
+    ("request_id", _REQUEST_ID),
+    ("user_id", _USER_ID),
+)
+
+
+def _inject_context_ids(record: Dict[str, Any]) -> None:
+    """loguru patcher：把当前上下文中的标识补充到 extra（显式 bind 的值优先）"""
+    extra = record["extra"]
+    for key, var in _CONTEXT_ID_VARS:
+        value = var.get()
+        if value is not None and key not in extra:
+            extra[key] = value
+
+
+_logger = _base_logger.patch(_inject_context_ids)
+
+
+@contextmanager
+def log_context(
+    trace_id: Optional[str] = None,
+    request_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> Iterator[None]:
+    """
+    在当前上下文（线程或 asyncio 任务）中设置请求级标识，退出时自动恢复
+
+    作用域内所有经本模块 logger 输出的记录都会带上这些字段。
+    """
+    tokens = [
+        (var, var.set(value))
+        for value, var in ((trace_id, _TRACE_ID), (request_id, _REQUEST_ID), (user_id, _USER_ID))
+        if value is not None
+    ]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+# 默认格式模板在导入时构建一次，各次 add 复用同一字符串
+_CONSOLE_FORMAT = (
+    "<green>{time:HH:mm:ss.SSS}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+    "<level>{message}</level>"
+)
+_FILE_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | "
+    "{name}:{function}:{line} | {message}"
+)
+
+# configure_logging() 是否已执行（或正在执行）
+_configured = False
+_configure_lock = threading.Lock()
+
+# 设置 AGENTKIT_AUTO_CONFIGURE_LOGGING=1 时，首次 get_logger() 会自动执行 configure_logging()
+_AUTO_CONFIGURE = os.getenv("AGENTKIT_AUTO_CONFIGURE_LOGGING") == "1"
+
+
+@lru_cache(maxsize=1)
+def _resolve_env() -> Tuple[str, str]:
+    """读取并缓存 (ENV, LOG_LEVEL)，进程内只解析一次环境变量"""
+    env = os.getenv("ENV", "development").lower()
+    log_level = os.getenv("LOG_LEVEL", "DEBUG" if env == "development" else "INFO").upper()
+    return env, log_level
+
+
+def _json_dumps(value: Any) -> str:
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _public_extra(extra: Dict[str, Any]) -> Dict[str, Any]:
+    """去掉 _orjson_format 写入的中间结果（同一记录会依次经过多个 sink）"""
+    if "_serialized" not in extra:
+        return extra
+    return {key: value for key, value in extra.items() if key != "_serialized"}
+
+
+def _format_exception(record: Dict[str, Any]) -> str:
+    """把记录中的异常渲染为完整的回溯文本（与 loguru serialize=True 的 text 字段一致的标准格式）"""
+    exc = record["exception"]
+    return "".join(traceback.format_exception(exc.type, exc.value, exc.traceback))
+
+
+# JSON 行模板在导入时拆分为固定片段与取值函数（参照 Envoy JsonFormatter 的做法），
+# 每条记录只需按序取值并拼接，无需再构造中间 dict 或解析格式串
+_JSON_LINE_PIECES = (
+    '{"time":"',
+    lambda r: r["time"].isoformat(),
+    '","level":"',
+    lambda r: r["level"].name,
+    '","message":',
+    lambda r: _json_dumps(r["message"]),
+    ',"name":',
+    lambda r: _json_dumps(r["name"]),
+    ',"function":',
+    lambda r: _json_dumps(r["function"]),
+    ',"line":',
+    lambda r: str(r["line"]),
+    ',"extra":',
+    lambda r: _json_dumps(_public_extra(r["extra"])),
+    lambda r: "" if r["exception"] is None else ',"exception":' + _json_dumps(_format_exception(r)),
+    "}",
+)
+
+
+def _render_json_line(record: Dict[str, Any]) -> str:
+    """按预编译片段把日志记录渲染为一行 JSON（不含换行）"""
+    return "".join(
+        piece if piece.__class__ is str else piece(record) for piece in _JSON_LINE_PIECES
+    )
+
+
+def _orjson_format(record: Dict[str, Any]) -> str:
+    """
+    以 orjson 序列化日志记录的 format 函数
+
+    替代 loguru 内置 serialize=True 所用的标准库 json；datetime 等类型由 orjson
+    原生处理，无法序列化的对象回退为 str。结果写入 extra 后由模板原样输出。
+
+    输出为扁平的一行 JSON，而非 loguru 的 {"text": ..., "record": {...}} 结构：
+    字段为 time（ISO 8601）、level（级别名）、message、name、function、line、extra，
+    有异常时另含 exception（完整回溯文本）。loguru 结构中的 elapsed、file、module、
+    process、thread 以及 level 的 no/icon 不再输出；需要原结构时请传入 format_template
+    或直接使用 loguru 的 serialize=True。
+    """
+    record["extra"]["_serialized"] = _render_json_line(record)
+    return "{extra[_serialized]}\n"
+
+
+class BatchingSink:
+    """
+    批量写出的 loguru sink
+
+    记录先进入缓冲区，累计 max_batch 条或距首条超过 max_delay 秒后一次性
+    write + flush，突发负载下把逐条 write 系统调用合并为一次。后台线程在
+    缓冲区非空时等待 max_delay 后刷出，类似 Log4j 的 endOfBatch：
+    队列排空后不会有记录滞留在缓冲区。
+
+    由 LoggerConfigurator 创建的实例在重新配置或进程退出时自动 stop；
+    直接创建时由调用方负责调用 stop()。
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        max_batch: int = 64,
+        max_delay: float = 0.005,
+        render: Optional[Callable[[Dict[str, Any]], str]] = None,
+    ):
+        """
+        Args:
+            stream: 输出流
+            max_batch: 单次写出的最大记录数
+            max_delay: 记录在缓冲区中的最长停留时间（秒）
+            render: 可选，直接由 record 渲染输出行（不含换行），替代 loguru 格式化的文本
+        """
+        self._stream = stream
+        self._render = render
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._buffer: List[str] = []
+        self._first_at = 0.0
+        self._lock = threading.Lock()
+        self._pending = threading.Event()
+        self._stopped = False
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="agentkit-log-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def __call__(self, message: str) -> None:
+        if self._render is not None:
+            message = self._render(message.record) + "\n"
+        with self._lock:
+            if not self._buffer:
+                self._first_at = time.monotonic()
+                self._pending.set()
+            self._buffer.append(message)
+            if (
+                len(self._buffer) >= self._max_batch
+                or time.monotonic() - self._first_at >= self._max_delay
+            ):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """立即写出缓冲区中的全部记录"""
+        with self._lock:
+            self._flush_locked()
+
+    def stop(self) -> None:
+        """停止后台线程并写出剩余记录（可重复调用）"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._pending.set()
+        self._flusher.join(timeout=1.0)
+        self.flush()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        self._stream.write("".join(self._buffer))
+        self._stream.flush()
+        self._buffer.clear()
+        self._pending.clear()
+
+    def _flush_loop(self) -> None:
+        while not self._stopped:
+            self._pending.wait()
+            if self._stopped:
+                return
+            time.sleep(self._max_delay)
+            self.flush()
+
+
+# LoggerConfigurator 当前使用的批量 sink 及其 loguru handler id；同一时间只保留一个
+_batching_sink: Optional[Tuple[BatchingSink, int]] = None
+_batching_sink_lock = threading.Lock()
+
+
+def _replace_batching_sink(current: Optional[Tuple[BatchingSink, int]]) -> None:
+    """登记新的批量 sink，并移除、停止上一个（写出其剩余记录、结束后台线程）"""
+    global _batching_sink
+    with _batching_sink_lock:
+        previous, _batching_sink = _batching_sink, current
+    if previous is None:
+        return
+    sink, handler_id = previous
+    try:
+        _logger.remove(handler_id)
+    except ValueError:
+        # 已被 logger.remove() 一并移除
+        pass
+    sink.stop()
+
+
+# 只注册一次：退出时停止当前的批量 sink
+atexit.register(_replace_batching_sink, None)
 
 
 class LogPathStrategy(ABC):
@@ -60,27 +327,41 @@ class LoggerConfigurator:
         # 清理默认处理器，确保干净的配置环境
         if clean_start:
             _logger.remove()
+            _replace_batching_sink(None)
     
     def configure_console(self, 
                          format_template: Optional[str] = None,
-                         colorize: bool = True) -> 'LoggerConfigurator':
-        """配置控制台日志输出"""
-        default_format = (
-            "<green>{time:HH:mm:ss.SSS}</green> | "
-            "<level>{level: <8}</level> | "
-            "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
-            "<level>{message}</level>"
-        )
-        
-        _logger.add(
-            sys.stderr,
-            format=format_template or default_format,
+                         colorize: bool = True,
+                         batch: bool = False,
+                         serialize: bool = False,
+                         diagnose: bool = False) -> 'LoggerConfigurator':
+        """
+        配置控制台日志输出
+
+        batch=True 时经 BatchingSink 合并写出（不支持着色），适合生产环境的高吞吐场景；
+        serialize=True 且未指定格式时输出 orjson 序列化的 JSON 行；
+        diagnose=True 时在异常回溯中展开变量值（仅建议调试时开启）。
+        """
+        if serialize and format_template is None and batch:
+            # 由 sink 直接渲染 JSON 行，loguru 只需处理最简单的格式串
+            sink, log_format = BatchingSink(sys.stderr, render=_render_json_line), "{message}"
+        elif serialize and format_template is None:
+            sink, log_format = sys.stderr, _orjson_format
+        else:
+            sink = BatchingSink(sys.stderr) if batch else sys.stderr
+            log_format = format_template or _CONSOLE_FORMAT
+
+        handler_id = _logger.add(
+            sink,
+            format=log_format,
             level=self.log_level,
-            colorize=colorize,
+            colorize=colorize and not batch and not serialize,
             backtrace=True,
-            diagnose=True,
+            diagnose=diagnose,
             enqueue=False,
         )
+        if isinstance(sink, BatchingSink):
+            _replace_batching_sink((sink, handler_id))
         
         self._handlers.append("console")
         return self
@@ -91,26 +372,28 @@ class LoggerConfigurator:
                       serialize: bool = True,
                       rotation: str = "1 hour",
                       retention: str = "7 days",
+                      diagnose: bool = False,
                       **kwargs) -> 'LoggerConfigurator':
         """配置文件日志输出"""
         
         try:
             log_path = path_strategy.get_log_path(self.service_name)
-            
-            default_format = (
-                "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | "
-                "{name}:{function}:{line} | {message}"
-            )
-            
+
+            # 未指定格式的 JSON 输出走 orjson，替代 loguru 内置的标准库 json 序列化
+            if serialize and format_template is None:
+                log_format, serialize = _orjson_format, False
+            else:
+                log_format = format_template or _FILE_FORMAT
+
             _logger.add(
                 log_path,
-                format=format_template or default_format,
+                format=log_format,
                 level="DEBUG",
                 rotation=rotation,
                 retention=retention,
                 serialize=serialize,
                 backtrace=True,
-                diagnose=True,
+                diagnose=diagnose,
                 enqueue=True,
                 **kwargs
             )
@@ -137,25 +420,60 @@ class LoggerConfigurator:
     
     def configure_production(self) -> 'LoggerConfigurator':
         """生产环境默认配置"""
-        return self.configure_console(colorize=False)
+        return self.configure_console(colorize=False, batch=True, serialize=True)
     
     def get_active_handlers(self) -> list:
         """获取已激活的日志处理器列表"""
         return self._handlers.copy()
 
 
+# 允许采样的日志级别（对应 ContextualLogger 上的方法名）
+_SAMPLEABLE_LEVELS = frozenset({"trace", "debug", "info"})
+
+
+def _should_sample(rate: float, trace_id: Optional[str]) -> bool:
+    """
+    判断本条记录是否保留
+
+    有 trace_id 时按其哈希确定性采样，同一请求的记录要么全部保留、要么全部丢弃；
+    否则退化为随机采样。
+    """
+    if trace_id is None:
+        trace_id = _TRACE_ID.get()
+    if trace_id is None:
+        return random.random() < rate
+    return zlib.crc32(str(trace_id).encode()) < rate * 0x100000000
+
+
 class ContextualLogger:
     """支持上下文的 Logger 包装器"""
     
-    def __init__(self, base_logger=None):
+    def __init__(
+        self,
+        base_logger=None,
+        sample_rates: Optional[Dict[str, float]] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            base_logger: 底层 loguru logger
+            sample_rates: 可选，按级别名（TRACE/DEBUG/INFO）设置的保留比例，
+                例如 {"DEBUG": 0.01, "INFO": 0.1}；WARNING 及以上级别始终完整输出
+            context: 已绑定的上下文（由 bind 传递）
+        """
         self._logger = base_logger or _logger
-        self._context: Dict[str, Any] = {}
+        self._context: Dict[str, Any] = context or {}
+        self._sample_rates: Dict[str, float] = {
+            level.lower(): rate
+            for level, rate in (sample_rates or {}).items()
+            if level.lower() in _SAMPLEABLE_LEVELS and rate < 1.0
+        }
     
     def bind(self, **kwargs) -> "ContextualLogger":
         """绑定上下文信息，返回新的 logger 实例"""
         new_context = {**self._context, **kwargs}
         bound_logger = self._logger.bind(**new_context)
-        return ContextualLogger(bound_logger)
+        return ContextualLogger(bound_logger, self._sample_rates, new_context)
     
     def contextualize(self, **kwargs):
         """上下文管理器，自动绑定和清理上下文"""
@@ -173,69 +491,90 @@ class ContextualLogger:
         """便捷方法：绑定 user_id"""
         return self.bind(user_id=user_id)
     
-    # 代理所有 loguru 方法
-    def trace(self, message: str, *args, **kwargs):
-        return self._logger.trace(message, *args, **kwargs)
-    
-    def debug(self, message: str, *args, **kwargs):
-        return self._logger.debug(message, *args, **kwargs)
-    
-    def info(self, message: str, *args, **kwargs):
-        return self._logger.info(message, *args, **kwargs)
-    
-    def success(self, message: str, *args, **kwargs):
-        return self._logger.success(message, *args, **kwargs)
-    
-    def warning(self, message: str, *args, **kwargs):
-        return self._logger.warning(message, *args, **kwargs)
-    
-    def error(self, message: str, *args, **kwargs):
-        return self._logger.error(message, *args, **kwargs)
-    
-    def critical(self, message: str, *args, **kwargs):
-        return self._logger.critical(message, *args, **kwargs)
-    
-    def exception(self, message: str, *args, **kwargs):
-        return self._logger.exception(message, *args, **kwargs)
-    
-    def catch(self, *args, **kwargs):
-        """异常捕获装饰器"""
-        return self._logger.catch(*args, **kwargs)
-    
-    def add(self, *args, **kwargs):
-        """添加新的 handler"""
-        return self._logger.add(*args, **kwargs)
-    
-    def remove(self, *args, **kwargs):
-        """移除 handler"""
-        return self._logger.remove(*args, **kwargs)
+    def __getattr__(self, name: str):
+        """
+        其余属性（trace/debug/info/.../catch/add/remove 等）直接委托给底层 logger
+
+        解析出的绑定方法缓存到实例 __dict__，之后的调用是普通属性读取；
+        不再多一层 Python 包装帧，loguru 记录的调用位置也因此指向真实调用方。
+        """
+        # 私有属性（包括初始化前的 _logger）不做委托，避免递归
+        if name.startswith("_"):
+            raise AttributeError(name)
+        rate = self._sample_rates.get(name)
+        if rate is None:
+            attr = getattr(self._logger, name)
+        else:
+            attr = self._make_sampled(name, rate)
+        self.__dict__[name] = attr
+        return attr
 
+    def _make_sampled(self, name: str, rate: float):
+        """构造带采样的日志方法；depth=1 使 loguru 记录的调用位置跳过这一层"""
+        log_method = getattr(self._logger.opt(depth=1), name)
+        trace_id = self._context.get("trace_id")
 
-def get_logger(name: Optional[str] = None, contextual: bool = False):
+        def sampled(message: str, *args, **kwargs):
+            if _should_sample(rate, trace_id):
+                log_method(message, *args, **kwargs)
+
+        return sampled
+
+
+def get_logger(
+    name: Optional[str] = None,
+    contextual: bool = False,
+    sample_rates: Optional[Dict[str, float]] = None,
+):
     """
     获取配置好的 logger 实例
     
     Args:
         name: logger 名称，通常传入 __name__
         contextual: 是否返回 ContextualLogger 包装实例
+        sample_rates: 可选，TRACE/DEBUG/INFO 级别的采样比例（仅 ContextualLogger 生效）
         
     Returns:
         Logger 实例（原生 loguru 或 ContextualLogger 包装）
     """
+    if _AUTO_CONFIGURE and not _configured:
+        configure_logging()
+
     base_logger = _logger
     if name:
         base_logger = _logger.bind(name=name)
     
-    if contextual:
-        return ContextualLogger(base_logger)
+    if contextual or sample_rates:
+        return ContextualLogger(base_logger, sample_rates)
     return base_logger
 
 
 def configure_logging() -> None:
-    """配置全局日志系统，应用启动时调用一次（向后兼容）"""
-    env = os.getenv("ENV", "development").lower()
-    log_level = os.getenv("LOG_LEVEL", "DEBUG" if env == "development" else "INFO").upper()
-    
+    """
+    配置全局日志系统，应用启动时调用一次（向后兼容）
+
+    重复调用直接返回，不会再次 remove()/add() 处理器。标记在配置前设置，
+    配置过程中产生的日志（经由 get_logger）不会再次触发配置。
+    """
+    global _configured
+    if _configured:
+        return
+    with _configure_lock:
+        if _configured:
+            return
+        _configured = True
+
+    try:
+        _apply_default_configuration()
+    except Exception:
+        _configured = False
+        raise
+
+
+def _apply_default_configuration() -> None:
+    """按 ENV / LOG_LEVEL 安装默认的控制台处理器"""
+    env, log_level = _resolve_env()
+
     configurator = LoggerConfigurator(log_level=log_level, clean_start=True)
     
     if env in ("production", "prod"):
@@ -252,15 +591,28 @@ def configure_logging() -> None:
     )
 
 
-# 导出默认 logger 实例（向后兼容）
-# 注意：不再自动配置，应用需要主动调用 configure_logging() 或使用 loguru-support
-logger = get_logger(contextual=True)
+def __getattr__(name: str):
+    """
+    默认 logger 实例（向后兼容）按需创建
+
+    首次访问 ``logger`` 时才构造 ContextualLogger 并缓存到模块全局。
+    注意：默认不会自动配置，应用需要主动调用 configure_logging() 或使用 loguru-support；
+    设置 AGENTKIT_AUTO_CONFIGURE_LOGGING=1 时在首次 get_logger() 时自动配置。
+    """
+    if name == "logger":
+        value = get_logger(contextual=True)
+        globals()["logger"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # 导出的公共接口
 __all__ = [
     'LoggerConfigurator', 
     'LogPathStrategy', 
+    'BatchingSink',
     'ContextualLogger',
+    'log_context',
     'get_logger',
     'configure_logging',  # 向后兼容
     'logger'  # 向后兼容
@@ -8,8 +8,10 @@
 """
 
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
 # 标准项目标记文件列表
@@ -22,6 +24,9 @@ DEFAULT_PROJECT_MARKERS = [
     "composer.json",       # PHP 项目
 ]
 
+# 文件名中允许之外的字符（预编译，替换在 C 层完成）
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._\-]")
+
 
 def find_project_root(marker_files: Optional[List[str]] = None) -> Path:
     """
@@ -38,13 +43,17 @@ def find_project_root(marker_files: Optional[List[str]] = None) -> Path:
     if marker_files is None:
         marker_files = DEFAULT_PROJECT_MARKERS
     
-    current = Path.cwd()
-    
+    # 结果按 (当前目录, 标记文件) 缓存，重复调用无需再逐级 stat
+    return _find_project_root_cached(Path.cwd(), tuple(marker_files))
+
+
+@lru_cache(maxsize=32)
+def _find_project_root_cached(current: Path, marker_files: Tuple[str, ...]) -> Path:
+    """find_project_root 的缓存实现"""
     # 从当前目录向上查找
-    for parent in [current] + list(current.parents):
-        for marker in marker_files:
-            if (parent / marker).exists():
-                return parent
+    for parent in (current, *current.parents):
+        if any((parent / marker).exists() for marker in marker_files):
+            return parent
     
     # 如果找不到，返回当前目录
     return current
@@ -79,8 +88,7 @@ def get_safe_filename(filename: str, max_length: int = 255) -> str:
         str: 安全的文件名
     """
     # 替换非法字符
-    safe_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_."
-    safe_filename = "".join(c if c in safe_chars else "_" for c in filename)
+    safe_filename = _UNSAFE_FILENAME_CHARS.sub("_", filename)
     
     # 限制长度
     if len(safe_filename) > max_length:
@@ -114,23 +122,30 @@ def format_file_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f} {size_names[i]}"
 
 
-def is_writable_directory(path: Path) -> bool:
+def is_writable_directory(path: Path, strict: bool = False) -> bool:
     """
     检查目录是否可写
     
+    默认只做一次 os.access 检查；strict=True 时再实际创建并删除一个临时文件，
+    用于识别 ACL、只读挂载等 os.access 无法反映的情况。
+    
     Args:
         path: 目录路径
+        strict: 是否通过实际写入临时文件进行确认
     
     Returns:
         bool: 可写返回 True，否则返回 False
     """
     try:
-        if not path.exists():
+        if not path.is_dir():
             return False
         
-        if not path.is_dir():
+        if not os.access(path, os.W_OK):
             return False
         
+        if not strict:
+            return True
+        
         # 尝试创建一个临时文件来测试写权限
         test_file = path / ".write_test"
         test_file.touch()
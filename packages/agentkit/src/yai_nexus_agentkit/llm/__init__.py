@@ -2,14 +2,14 @@
 """
 该模块提供了基于 LangChain 的 LLM（大型语言模型）客户端的创建和管理功能。
 
-核心功能是 `LLMFactory` 类，它能够根据提供的配置动态地实例化和管理
+核心功能是 `LLMFactory` 类（全局单例可通过 `get_llm_factory()` 获取），它能够根据提供的配置动态地实例化和管理
 不同提供商的 LLM 客户端，如 OpenAI, ZhipuAI 等。
 """
 
 from langchain_core.language_models import BaseChatModel
 
 from .config import LLMConfig
-from .factory import LLMFactory, llm_factory
+from .factory import LLMFactory, get_llm_factory, llm_factory
 from .providers import LLMProvider
 from .models import (
     OpenAIModel,
@@ -26,6 +26,7 @@ __all__ = [
     # 核心工厂功能
     "LLMFactory",
     "llm_factory",  # 全局单例实例
+    "get_llm_factory",
     # 配置和枚举
     "LLMProvider",
     "LLMConfig",
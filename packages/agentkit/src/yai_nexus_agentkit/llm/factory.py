@@ -13,26 +13,30 @@ from .internal.registry import create_langchain_llm
 class LLMFactory:
     """
     LLM 客户端工厂，负责根据配置创建和缓存 LLM 客户端实例。
-    这是一个单例类，确保在整个应用中只有一个实例。
+    这是一个单例类，确保在整个应用中只有一个实例；
+    热路径上推荐用 `get_llm_factory()` 直接取得该实例。
     """
 
     _instance: Optional["LLMFactory"] = None
-    _lock = threading.Lock()
+    _instance_lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
-            with cls._lock:
+            with cls._instance_lock:
                 if not cls._instance:
                     cls._instance = super().__new__(cls)
         return cls._instance
 
     def __init__(self):
         # 防止重复初始化
-        if hasattr(self, "_initialized") and self._initialized:
+        if getattr(self, "_initialized", False):
             return
 
         self._configs: Dict[str, LLMConfig] = {}
         self._clients: Dict[str, BaseChatModel] = {}
+        # 仅保护 _model_locks 的插入；客户端构建按 model_id 分别加锁
+        self._lock = threading.Lock()
+        self._model_locks: Dict[str, threading.Lock] = {}
         self._initialized = True
         # 在这里可以添加从文件或环境变量加载配置的逻辑
         # self.load_configs_from_file(...)
@@ -72,7 +76,8 @@ class LLMFactory:
         获取一个 LLM 客户端实例。
 
         如果实例已缓存，则直接返回；否则，创建一个新实例并缓存。
-        此方法是线程安全的。
+        此方法是线程安全的：命中缓存时不加锁，首次创建时只锁定对应的
+        model_id，不同模型的首次加载可以并行进行。
 
         Args:
             model_id: 模型的唯一标识符。
@@ -80,11 +85,25 @@ class LLMFactory:
         Returns:
             一个 BaseChatModel 的实例。
         """
-        with self._lock:
-            if model_id not in self._clients:
-                # 客户端不存在，创建并缓存
-                self._clients[model_id] = self._create_llm_instance(model_id)
-            return self._clients[model_id]
+        client = self._clients.get(model_id)
+        if client is not None:
+            return client
+
+        with self._get_model_lock(model_id):
+            # 双重检查：等待锁期间可能已由其他线程创建
+            client = self._clients.get(model_id)
+            if client is None:
+                client = self._create_llm_instance(model_id)
+                self._clients[model_id] = client
+            return client
+
+    def _get_model_lock(self, model_id: str) -> threading.Lock:
+        """获取（必要时创建）指定 model_id 的构建锁"""
+        lock = self._model_locks.get(model_id)
+        if lock is None:
+            with self._lock:
+                lock = self._model_locks.setdefault(model_id, threading.Lock())
+        return lock
 
     def _create_llm_instance(self, model_id: str) -> BaseChatModel:
         """
@@ -111,5 +130,14 @@ class LLMFactory:
         )
 
 
-# 全局单例
+# 全局单例，在模块导入时创建
 llm_factory = LLMFactory()
+
+
+def get_llm_factory() -> LLMFactory:
+    """
+    返回全局 LLM 工厂单例。
+
+    单例在模块导入时已创建，这里直接返回，不经过 `LLMFactory()` 的构造流程。
+    """
+    return llm_factory
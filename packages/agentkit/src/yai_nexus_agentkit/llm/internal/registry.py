@@ -1,12 +1,69 @@
 # -*- coding: utf-8 -*-
 """提供商注册表实现，并提供统一的创建函数。"""
 
-from typing import Any, Callable, Dict
+import importlib
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Dict, Type
 
 from langchain_core.language_models import BaseChatModel
 
 from ..providers import LLMProvider
 
+logger = logging.getLogger(__name__)
+
+# 可选的 HTTP 连接池调优参数。
+# httpx 默认最多 100 个连接，高并发 SSE 场景下会排队并反复进行 TCP+TLS 握手。
+HTTP_MAX_CONNECTIONS = 2000
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 1500
+HTTP_TIMEOUT = 120.0
+
+# 配置中开启连接池调优的开关字段（不会传给 LangChain 构造函数）
+POOLED_HTTP_CLIENT_FLAG = "pooled_http_client"
+
+# 支持注入 http_async_client 的 OpenAI 兼容提供商
+_OPENAI_COMPATIBLE_PROVIDERS = frozenset(
+    (LLMProvider.OPENAI, LLMProvider.OPENROUTER, LLMProvider.DOUBAO)
+)
+
+
+def create_http_async_client(timeout: float = HTTP_TIMEOUT):
+    """
+    创建调优过连接上限的 httpx.AsyncClient。
+
+    返回的客户端绑定于首次使用它的事件循环，由调用方负责其生命周期；
+    也可以自行创建后通过配置中的 http_async_client 字段传入。
+    """
+    import httpx
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(timeout),
+    )
+
+
+def _with_pooled_http_client(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    按配置开关为 OpenAI 兼容客户端注入调优的连接池。
+
+    调用方已提供 http_async_client，或配置了 openai_proxy（需由 openai SDK 自行建连）时不注入；
+    配置中的 timeout/request_timeout 会沿用到连接池上。
+    """
+    if config.get("http_async_client") is not None:
+        return config
+    if config.get("openai_proxy"):
+        logger.warning(
+            f"已配置 openai_proxy，忽略 {POOLED_HTTP_CLIENT_FLAG}，使用 SDK 默认的 HTTP 客户端。"
+        )
+        return config
+    timeout = config.get("timeout", config.get("request_timeout"))
+    if not isinstance(timeout, (int, float)):
+        timeout = HTTP_TIMEOUT
+    return {**config, "http_async_client": create_http_async_client(timeout)}
+
 
 # ------------------------------------------------------------------------------
 #  私有创建函数 (Private Creator Functions)
@@ -14,51 +71,62 @@ from ..providers import LLMProvider
 # ------------------------------------------------------------------------------
 
 
-def _create_openai_client(config: Dict[str, Any]) -> BaseChatModel:
-    """创建 OpenAI 客户端。"""
+@lru_cache(maxsize=None)
+def _load_chat_class(module_name: str, class_name: str, install_hint: str) -> Type[BaseChatModel]:
+    """
+    导入并缓存提供商的 ChatModel 类。
+
+    成功的结果被缓存，之后创建客户端不再经过 import 语句与 try/except；
+    导入失败时抛出带安装提示的 ImportError（失败不会被缓存）。
+    """
     try:
-        from langchain_openai import ChatOpenAI
+        # langchain_community 等包按属性懒加载，getattr 同样可能触发 ImportError
+        return getattr(importlib.import_module(module_name), class_name)
     except ImportError:
-        raise ImportError(
-            "使用 OpenAI 需要安装 langchain-openai 包。"
-            "请运行: pip install langchain-openai"
-        )
+        raise ImportError(install_hint)
+
+
+def _create_openai_client(config: Dict[str, Any]) -> BaseChatModel:
+    """创建 OpenAI 客户端。"""
+    ChatOpenAI = _load_chat_class(
+        "langchain_openai",
+        "ChatOpenAI",
+        "使用 OpenAI 需要安装 langchain-openai 包。"
+        "请运行: pip install langchain-openai",
+    )
     return ChatOpenAI(**config)
 
 
 def _create_zhipu_client(config: Dict[str, Any]) -> BaseChatModel:
     """创建 ZhipuAI 客户端。"""
-    try:
-        from langchain_community.chat_models import ChatZhipuAI
-    except ImportError:
-        raise ImportError(
-            "使用 ZhipuAI 需要安装 langchain-community 和 zhipuai 包。"
-            "请运行: pip install langchain-community zhipuai"
-        )
+    ChatZhipuAI = _load_chat_class(
+        "langchain_community.chat_models",
+        "ChatZhipuAI",
+        "使用 ZhipuAI 需要安装 langchain-community 和 zhipuai 包。"
+        "请运行: pip install langchain-community zhipuai",
+    )
     return ChatZhipuAI(**config)
 
 
 def _create_anthropic_client(config: Dict[str, Any]) -> BaseChatModel:
     """创建 Anthropic 客户端。"""
-    try:
-        from langchain_anthropic import ChatAnthropic
-    except ImportError:
-        raise ImportError(
-            "使用 Anthropic 需要安装 langchain-anthropic 包。"
-            "请运行: pip install langchain-anthropic"
-        )
+    ChatAnthropic = _load_chat_class(
+        "langchain_anthropic",
+        "ChatAnthropic",
+        "使用 Anthropic 需要安装 langchain-anthropic 包。"
+        "请运行: pip install langchain-anthropic",
+    )
     return ChatAnthropic(**config)
 
 
 def _create_openrouter_client(config: Dict[str, Any]) -> BaseChatModel:
     """创建 OpenRouter 客户端。"""
-    try:
-        from langchain_openai import ChatOpenAI
-    except ImportError:
-        raise ImportError(
-            "使用 OpenRouter (通过 OpenAI 兼容层) 需要安装 langchain-openai 包。"
-            "请运行: pip install langchain-openai"
-        )
+    ChatOpenAI = _load_chat_class(
+        "langchain_openai",
+        "ChatOpenAI",
+        "使用 OpenRouter (通过 OpenAI 兼容层) 需要安装 langchain-openai 包。"
+        "请运行: pip install langchain-openai",
+    )
     # OpenRouter 使用 OpenAI 兼容的 API，因此我们可以复用 ChatOpenAI
     # LangChain 会自动从环境变量中读取 OPENROUTER_API_KEY
     return ChatOpenAI(**config)
@@ -66,25 +134,23 @@ def _create_openrouter_client(config: Dict[str, Any]) -> BaseChatModel:
 
 def _create_tongyi_client(config: Dict[str, Any]) -> BaseChatModel:
     """创建通义千问客户端。"""
-    try:
-        from langchain_community.chat_models import ChatTongyi
-    except ImportError:
-        raise ImportError(
-            "使用通义千问需要安装 langchain-community 和 dashscope 包。"
-            "请运行: pip install langchain-community dashscope"
-        )
+    ChatTongyi = _load_chat_class(
+        "langchain_community.chat_models",
+        "ChatTongyi",
+        "使用通义千问需要安装 langchain-community 和 dashscope 包。"
+        "请运行: pip install langchain-community dashscope",
+    )
     return ChatTongyi(**config)
 
 
 def _create_doubao_client(config: Dict[str, Any]) -> BaseChatModel:
     """创建豆包客户端。"""
-    try:
-        from langchain_openai import ChatOpenAI
-    except ImportError:
-        raise ImportError(
-            "使用豆包需要安装 langchain-openai 包。"
-            "请运行: pip install langchain-openai"
-        )
+    ChatOpenAI = _load_chat_class(
+        "langchain_openai",
+        "ChatOpenAI",
+        "使用豆包需要安装 langchain-openai 包。"
+        "请运行: pip install langchain-openai",
+    )
     # 豆包使用 OpenAI 兼容的 API
     return ChatOpenAI(**config)
 
@@ -121,7 +187,8 @@ def create_langchain_llm(
 
     Args:
         provider: LLM 提供商枚举。
-        config: 不包含 provider 字段的配置字典。
+        config: 不包含 provider 字段的配置字典。对 OpenAI 兼容提供商，
+            设置 pooled_http_client=True 可为该客户端创建调优的 HTTP 连接池。
 
     Returns:
         一个 BaseChatModel 的实例。
@@ -133,4 +200,10 @@ def create_langchain_llm(
     if not creator_func:
         raise ValueError(f"不支持的 LLM 提供商：{provider.value}")
 
+    # 连接池调优为显式开启：开关字段本身不传给 LangChain
+    if POOLED_HTTP_CLIENT_FLAG in config:
+        config = dict(config)
+        if config.pop(POOLED_HTTP_CLIENT_FLAG) and provider in _OPENAI_COMPATIBLE_PROVIDERS:
+            config = _with_pooled_http_client(config)
+
     return creator_func(config)
@@ -2,7 +2,8 @@
 """LLM 模型枚举定义。"""
 
 from enum import Enum
-from typing import Dict, Type, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Type, Optional
 
 
 class OpenAIModel(str, Enum):
@@ -87,14 +88,21 @@ class OpenRouterModel(str, Enum):
     DEEPSEEK_CODER = "deepseek/deepseek-coder"
 
 
-# 统一的模型枚举映射
-MODEL_MAPPING: Dict[str, Type[Enum]] = {
-    "openai": OpenAIModel,
-    "anthropic": AnthropicModel,
-    "zhipu": ZhipuModel,
-    "tongyi": TongyiModel,
-    "doubao": DoubaoModel,
-    "openrouter": OpenRouterModel,
+# 统一的模型枚举映射（只读，可安全地全局共享；键均为小写）
+MODEL_MAPPING: Mapping[str, Type[Enum]] = MappingProxyType(
+    {
+        "openai": OpenAIModel,
+        "anthropic": AnthropicModel,
+        "zhipu": ZhipuModel,
+        "tongyi": TongyiModel,
+        "doubao": DoubaoModel,
+        "openrouter": OpenRouterModel,
+    }
+)
+
+# 每个提供商的默认模型（枚举中的第一个成员），导入时计算一次
+_DEFAULT_MODEL: Dict[str, str] = {
+    provider: next(iter(model_enum)).value for provider, model_enum in MODEL_MAPPING.items()
 }
 
 
@@ -121,10 +129,5 @@ def get_default_model(provider: str) -> Optional[str]:
     Returns:
         默认模型名称，如果提供商不存在则返回 None
     """
-    model_enum = get_model_enum(provider)
-    if not model_enum:
-        return None
-
-    # 返回每个枚举的第一个模型作为默认模型
-    models = list(model_enum)
-    return models[0].value if models else None
+    # 每个枚举的第一个模型即默认模型，已预先计算
+    return _DEFAULT_MODEL.get(provider.lower())
@@ -1,13 +1,17 @@
 from .db_config import DatabaseConfig, TORTOISE_ORM_CONFIG_TEMPLATE
-from .repository import TortoiseRepository, ConversationRepository
+from .database import init_database, close_database
+from .repository import TortoiseRepository, ConversationRepository, MessageRepository
 from .checkpoint import PostgresCheckpoint
 from .models import AgentConversation, AgentMessage
 
 __all__ = [
     "DatabaseConfig",
     "TORTOISE_ORM_CONFIG_TEMPLATE",
+    "init_database",
+    "close_database",
     "TortoiseRepository",
     "ConversationRepository",
+    "MessageRepository",
     "PostgresCheckpoint",
     "AgentConversation",
     "AgentMessage",
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import itertools
+from types import MappingProxyType
 from typing import Any, Optional, Dict, List
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 from langgraph.checkpoint.base import CheckpointTuple
 from yai_nexus_agentkit.core.checkpoint import BaseCheckpoint
 from .db_config import DatabaseConfig
@@ -9,6 +14,13 @@ from tortoise.exceptions import DoesNotExist
 
 logger = logging.getLogger(__name__)
 
+# 共享同一连接池的 saver 实例数上限；每个 saver 自带一把锁，
+# 轮询分发可避免所有并发请求排队在同一把锁上
+SAVER_POOL_SIZE = 8
+
+# checkpoint 连接的固定参数，进程内只构造一次
+_BASE_CONNECTION_KWARGS = MappingProxyType({"autocommit": True, "row_factory": dict_row})
+
 
 class PostgresCheckpoint(BaseCheckpoint):
     """基于 PostgreSQL 的 Checkpoint 实现"""
@@ -16,31 +28,72 @@ class PostgresCheckpoint(BaseCheckpoint):
     def __init__(self, config: DatabaseConfig):
         self.config = config
         self.saver: Optional[AsyncPostgresSaver] = None
+        self._pool: Optional[AsyncConnectionPool] = None
+        self._savers: List[AsyncPostgresSaver] = []
+        self._saver_cycle = None
+        # 一次性初始化：快路径只判断布尔值；锁在首次需要时创建，
+        # 避免在 Python 3.9 下于事件循环之外构造 asyncio.Lock
+        self._ready = False
+        self._init_lock: Optional[asyncio.Lock] = None
+
+    async def _ensure(self) -> None:
+        """确保 setup 只执行一次；并发的首批调用方等待同一次初始化完成"""
+        if self._ready:
+            return
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if self._ready:
+                return
+            await self.setup()
+            self._ready = True
 
     async def setup(self):
-        """初始化 AsyncPostgresSaver"""
+        """初始化连接池和 AsyncPostgresSaver 实例组"""
         try:
-            self.saver = AsyncPostgresSaver.from_conn_string(self.config.db_url)
-            # The `setup` method in the new version of langgraph's saver might be `acreate_tables`
-            if hasattr(self.saver, "acreate_tables"):
-                await self.saver.acreate_tables()
-            elif hasattr(self.saver, "setup"):
-                await self.saver.setup()
+            self._pool = AsyncConnectionPool(
+                conninfo=self.config.db_url,
+                min_size=self.config.min_connections,
+                max_size=self.config.max_connections,
+                timeout=self.config.connection_timeout,
+                kwargs={
+                    **_BASE_CONNECTION_KWARGS,
+                    "prepare_threshold": self.config.prepare_threshold,
+                },
+                open=False,
+            )
+            # wait=True 会在返回前建好 min_size 个连接，避免首批请求承担建连延迟
+            await self._pool.open(wait=True)
+
+            saver_count = max(1, min(SAVER_POOL_SIZE, self.config.max_connections // 2))
+            self._savers = [AsyncPostgresSaver(self._pool) for _ in range(saver_count)]
+            self._saver_cycle = itertools.cycle(self._savers)
+            self.saver = self._savers[0]
+            # 建表只需执行一次，所有 saver 共享同一套表
+            await self.saver.setup()
         except Exception as e:
             logger.error(f"Failed to setup checkpoint: {e}")
             raise
 
+    def _next_saver(self) -> AsyncPostgresSaver:
+        """轮询选择下一个 saver"""
+        return next(self._saver_cycle)
+
     async def cleanup(self):
         """清理资源"""
-        if self.saver and hasattr(self.saver, "close"):
-            await self.saver.close()
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        self._savers = []
+        self._saver_cycle = None
+        self.saver = None
+        self._ready = False
 
     async def get(self, convo_id: str) -> Optional[CheckpointTuple]:
-        if not self.saver:
-            await self.setup()
+        await self._ensure()
 
         try:
-            return await self.saver.aget_tuple(convo_id)
+            return await self._next_saver().aget_tuple(convo_id)
         except DoesNotExist:
             return None
         except Exception as e:
@@ -48,28 +101,25 @@ class PostgresCheckpoint(BaseCheckpoint):
             return None
 
     async def put(self, convo_id: str, checkpoint: Dict[str, Any]) -> None:
-        if not self.saver:
-            await self.setup()
+        await self._ensure()
 
         try:
-            await self.saver.aput(convo_id, checkpoint)
+            await self._next_saver().aput(convo_id, checkpoint)
         except Exception as e:
             logger.error(f"Failed to put checkpoint for {convo_id}: {e}")
 
     async def list(self, limit: int, offset: int) -> List[CheckpointTuple]:
-        if not self.saver:
-            await self.setup()
+        await self._ensure()
 
         try:
-            return await self.saver.alist(limit=limit, offset=offset)
+            return await self._next_saver().alist(limit=limit, offset=offset)
         except Exception as e:
             logger.error(f"Failed to list checkpoints: {e}")
             return []
 
     async def delete(self, key: str) -> bool:
         """删除检查点"""
-        if not self.saver:  # Changed from self.saver to self._saver_cm
-            await self.setup()
+        await self._ensure()
 
         try:
             # The new saver might not have a specific delete method.
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Tortoise ORM 的初始化与关闭"""
+import logging
+
+from tortoise import Tortoise
+
+from .db_config import DatabaseConfig
+
+logger = logging.getLogger(__name__)
+
+
+async def init_database(config: DatabaseConfig) -> None:
+    """
+    按 DatabaseConfig 初始化 Tortoise ORM。
+
+    连接参数取自 config.to_tortoise_config()（asyncpg 连接池大小、超时、
+    预编译语句缓存等）；config.generate_schemas 为 True 时同时建表和索引。
+
+    Args:
+        config: 数据库配置
+    """
+    await Tortoise.init(config=config.to_tortoise_config())
+    if config.generate_schemas:
+        # safe=True 生成 IF NOT EXISTS，对已有表和索引不做改动
+        await Tortoise.generate_schemas(safe=True)
+    logger.info("Database initialized")
+
+
+async def close_database() -> None:
+    """关闭 Tortoise ORM 的全部连接"""
+    await Tortoise.close_connections()
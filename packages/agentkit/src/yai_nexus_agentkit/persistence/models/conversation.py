@@ -1,7 +1,17 @@
 from tortoise import fields
+from tortoise.contrib.postgres.indexes import GinIndex
 from tortoise.models import Model
 
 
+class _PostgresGinIndex(GinIndex):
+    """只在 PostgreSQL 上创建的 GIN 索引，其他数据库生成表结构时跳过"""
+
+    def get_sql(self, schema_generator, model, safe):
+        if schema_generator.DIALECT != "postgres":
+            return ""
+        return super().get_sql(schema_generator, model, safe)
+
+
 class AgentConversation(Model):
     """会话模型"""
 
@@ -14,3 +24,9 @@ class AgentConversation(Model):
 
     class Meta:
         table = "agent_conversations"
+        # 支持 metadata_ @> {...} 包含查询走索引，而非全表扫描
+        indexes = [
+            _PostgresGinIndex(
+                fields=("metadata_",), name="idx_agent_conversations_metadata_gin"
+            )
+        ]
@@ -1,4 +1,5 @@
 from tortoise import fields
+from tortoise.indexes import Index
 from tortoise.models import Model
 
 
@@ -22,3 +23,11 @@ class AgentMessage(Model):
 
     class Meta:
         table = "agent_messages"
+        # 按会话分页读取时用于定位与排序：WHERE conversation_id = ? ORDER BY created_at DESC，
+        # 不是覆盖索引，命中的行仍需回表读取 id/role 等列
+        indexes = (
+            Index(
+                fields=("conversation_id", "created_at"),
+                name="idx_agent_messages_conversation_created",
+            ),
+        )
@@ -1,46 +1,290 @@
 # -*- coding: utf-8 -*-
-from typing import Generic, Type, TypeVar, Optional, List, Any
+import asyncio
+import copy
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from weakref import WeakKeyDictionary
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from tortoise import timezone
 from tortoise.models import Model
 from tortoise.transactions import in_transaction
 from tortoise.exceptions import IntegrityError
 from yai_nexus_agentkit.core.repository import BaseRepository
 import logging
-from .models import AgentConversation
+from .db_config import DatabaseConfig
+from .models import AgentConversation, AgentMessage
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T", bound=Model)
 
+# 批量写入时每条 SQL 语句携带的最大行数
+DEFAULT_BATCH_SIZE = 500
+# 单条语句允许的最大绑定参数数（低于 SQLite 的 999 上限）
+DEFAULT_CHUNK_MAX_PARAMS = 900
+# iter() 每次从数据库读取的行数
+DEFAULT_ITER_CHUNK_SIZE = 500
+
+# 消息分页读取的列投影
+_MESSAGE_SUMMARY_COLUMNS = ("id", "conversation_id", "role", "created_at")
+_MESSAGE_COLUMNS = _MESSAGE_SUMMARY_COLUMNS + ("content", "metadata_")
+
+# 每个连接池一个并发闸门：按事件循环分开保存（信号量不能跨循环使用），
+# 循环内再按 (db_url, max_connections) 区分数据库；循环被回收时随之释放
+_pool_semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, int], asyncio.Semaphore]]" = (
+    WeakKeyDictionary()
+)
+
+
+def _get_pool_semaphore(pool_key: Tuple[str, int]) -> asyncio.Semaphore:
+    """获取当前事件循环中该连接池的信号量，访问同一数据库的所有仓储共享"""
+    loop = asyncio.get_running_loop()
+    semaphores = _pool_semaphores.get(loop)
+    if semaphores is None:
+        semaphores = _pool_semaphores[loop] = {}
+    semaphore = semaphores.get(pool_key)
+    if semaphore is None:
+        semaphore = semaphores[pool_key] = asyncio.Semaphore(pool_key[1])
+    return semaphore
+
+
+# 读缓存：get / exists / count 的结果在进程内按 TTL 缓存，所有仓储实例共享
+READ_CACHE_MAXSIZE = 10_000
+_MISSING = object()
+
+
+class _TTLCache:
+    """带过期时间的 LRU 缓存（单线程事件循环内使用，无需加锁）"""
+
+    __slots__ = ("_data", "_maxsize")
+
+    def __init__(self, maxsize: int):
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._maxsize = maxsize
+
+    def get(self, key: Any) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+
+_read_cache = _TTLCache(READ_CACHE_MAXSIZE)
+# 每个模型的写入代数；键中带上代数，任何写入后旧条目自然失效
+_model_generations: Dict[str, int] = {}
+
+
+def _supports_returning(db) -> bool:
+    """数据库是否支持 UPDATE ... RETURNING（PostgreSQL，或 3.35 及以上的 SQLite）"""
+    dialect = db.capabilities.dialect
+    if dialect == "postgres":
+        return True
+    return dialect == "sqlite" and sqlite3.sqlite_version_info >= (3, 35)
+
 
 class TortoiseRepository(BaseRepository[T], Generic[T]):
     """基于 Tortoise ORM 的通用仓储实现"""
 
-    def __init__(self, model_cls: Type[T]):
+    def __init__(
+        self,
+        model_cls: Type[T],
+        db_config: Optional[DatabaseConfig] = None,
+        cache_ttl: float = 0.0,
+    ):
+        """
+        Args:
+            model_cls: 仓储对应的 Tortoise 模型
+            db_config: 数据库配置；提供时并发查询数不超过 max_connections，
+                超出的调用方排队等待，而不是在连接池耗尽时报错
+            cache_ttl: get / exists / count 结果的缓存时间（秒），0 表示不缓存。
+                本进程内的写入会立即使缓存失效；其他进程的写入最多延迟 cache_ttl 可见。
+                只缓存命中的结果（不存在的记录每次都查询），get 每次返回独立的副本
+        """
         self._model_cls = model_cls
+        self._pool_key = (db_config.db_url, db_config.max_connections) if db_config else None
+        self._cache_ttl = cache_ttl
+
+    def _cache_key(self, *parts: Any) -> Tuple[Any, ...]:
+        name = self._model_cls.__name__
+        return (name, _model_generations.get(name, 0)) + parts
+
+    def _cache_get(self, key: Tuple[Any, ...]) -> Any:
+        if self._cache_ttl <= 0:
+            return _MISSING
+        return _read_cache.get(key)
+
+    def _cache_set(self, key: Tuple[Any, ...], value: Any) -> None:
+        if self._cache_ttl > 0:
+            _read_cache.set(key, value, self._cache_ttl)
+
+    def _invalidate_cache(self) -> None:
+        """写入后递增模型代数，使该模型已缓存的读结果全部失效"""
+        name = self._model_cls.__name__
+        _model_generations[name] = _model_generations.get(name, 0) + 1
+
+    @asynccontextmanager
+    async def _slot(self):
+        """占用一个连接名额（未配置 db_config 时不限制）"""
+        if self._pool_key is None:
+            yield
+            return
+        async with _get_pool_semaphore(self._pool_key):
+            yield
 
     async def get(self, id: Any) -> Optional[T]:
+        key = self._cache_key("get", id)
+        cached = self._cache_get(key)
+        if cached is not _MISSING:
+            # 每个调用方拿到独立副本，未保存的修改不会泄漏给其他读者
+            return copy.deepcopy(cached)
         try:
-            return await self._model_cls.get_or_none(id=id)
+            async with self._slot():
+                entity = await self._model_cls.get_or_none(id=id)
         except Exception as e:
             logger.error(f"Failed to get {self._model_cls.__name__} with id {id}: {e}")
             return None
+        if entity is not None and self._cache_ttl > 0:
+            self._cache_set(key, copy.deepcopy(entity))
+        return entity
 
     async def list(self, limit: int = 100, offset: int = 0) -> List[T]:
+        query = self._model_cls.all().limit(limit).offset(offset)
         try:
-            return await self._model_cls.all().limit(limit).offset(offset)
+            async with self._slot():
+                return await query
         except Exception as e:
             logger.error(f"Failed to list {self._model_cls.__name__}: {e}")
             return []
 
     async def filter(self, **kwargs) -> List[T]:
+        query = self._model_cls.filter(**kwargs)
         try:
-            return await self._model_cls.filter(**kwargs)
+            async with self._slot():
+                return await query
         except Exception as e:
             logger.error(f"Failed to filter {self._model_cls.__name__}: {e}")
             return []
 
+    async def list_values(
+        self, *fields: str, limit: int = 100, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        分页读取指定列，以字典返回
+
+        使用 .values() 跳过模型实例构造，适合只读、直接序列化的场景。
+
+        Args:
+            *fields: 要读取的列，省略时读取全部列
+            limit: 返回的最大记录数
+            offset: 跳过的记录数
+        """
+        query = self._model_cls.all().limit(limit).offset(offset)
+        try:
+            async with self._slot():
+                return await query.values(*fields)
+        except Exception as e:
+            logger.error(f"Failed to list values of {self._model_cls.__name__}: {e}")
+            return []
+
+    async def filter_values(self, *fields: str, **kwargs) -> List[Dict[str, Any]]:
+        """
+        按条件读取指定列，以字典返回
+
+        Args:
+            *fields: 要读取的列，省略时读取全部列
+            **kwargs: 过滤条件
+        """
+        query = self._model_cls.filter(**kwargs)
+        try:
+            async with self._slot():
+                return await query.values(*fields)
+        except Exception as e:
+            logger.error(f"Failed to filter values of {self._model_cls.__name__}: {e}")
+            return []
+
+    async def iter(
+        self, chunk_size: int = DEFAULT_ITER_CHUNK_SIZE, **kwargs
+    ) -> AsyncIterator[T]:
+        """
+        逐个遍历符合条件的实体
+
+        按主键分块读取（WHERE pk > 上一块末尾 ORDER BY pk LIMIT chunk_size），
+        内存中最多只保留一块数据；连接名额只在读取每一块时占用。
+
+        Args:
+            chunk_size: 每次查询读取的行数
+            **kwargs: 过滤条件
+        """
+        async for row in self._iter_chunks(None, chunk_size, kwargs):
+            yield row
+
+    async def iter_values(
+        self, *fields: str, chunk_size: int = DEFAULT_ITER_CHUNK_SIZE, **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        逐行遍历符合条件的记录，以字典产出指定列（主键总会被读取）
+
+        Args:
+            *fields: 要读取的列，省略时读取全部列
+            chunk_size: 每次查询读取的行数
+            **kwargs: 过滤条件
+        """
+        async for row in self._iter_chunks(fields, chunk_size, kwargs):
+            yield row
+
+    async def _iter_chunks(
+        self,
+        fields: Optional[Sequence[str]],
+        chunk_size: int,
+        filters: Dict[str, Any],
+    ) -> AsyncIterator[Any]:
+        """按主键做键集分页；fields 为 None 时产出模型实例，否则产出字典"""
+        pk = self._model_cls._meta.pk_attr
+        if fields and pk not in fields:
+            fields = (pk, *fields)
+        last = None
+        while True:
+            query = self._model_cls.filter(**filters)
+            if last is not None:
+                query = query.filter(**{f"{pk}__gt": last})
+            query = query.order_by(pk).limit(chunk_size)
+            async with self._slot():
+                rows = await (query if fields is None else query.values(*fields))
+            for row in rows:
+                yield row
+            if len(rows) < chunk_size:
+                return
+            last = getattr(rows[-1], pk) if fields is None else rows[-1][pk]
+
     async def add(self, entity: T) -> T:
         try:
-            await entity.save()
+            async with self._slot():
+                await entity.save()
+            self._invalidate_cache()
             return entity
         except IntegrityError as e:
             logger.error(
@@ -52,41 +296,333 @@ class TortoiseRepository(BaseRepository[T], Generic[T]):
             raise
 
     async def update(self, entity: T) -> T:
-        await entity.save()
+        async with self._slot():
+            await entity.save()
+        self._invalidate_cache()
         return entity
 
     async def delete(self, id: Any) -> bool:
         try:
-            entity = await self._model_cls.get(id=id)
-            await entity.delete()
-            return True
-        except Exception:
+            # 单条 DELETE ... WHERE id=?，返回受影响行数
+            async with self._slot():
+                deleted = await self._model_cls.filter(id=id).delete()
+            if deleted:
+                self._invalidate_cache()
+            return deleted > 0
+        except Exception as e:
+            logger.error(f"Failed to delete {self._model_cls.__name__} with id {id}: {e}")
             return False
 
     async def exists(self, id: Any) -> bool:
-        return await self._model_cls.filter(id=id).exists()
+        key = self._cache_key("exists", id)
+        cached = self._cache_get(key)
+        if cached is not _MISSING:
+            return cached
+        async with self._slot():
+            found = await self._model_cls.filter(id=id).exists()
+        if found:
+            self._cache_set(key, found)
+        return found
 
-    async def bulk_create(self, entities: List[T]) -> List[T]:
-        """批量创建实体"""
+    async def bulk_create(
+        self,
+        entities: List[T],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        chunk_max_params: int = DEFAULT_CHUNK_MAX_PARAMS,
+        ignore_conflicts: bool = False,
+    ) -> List[T]:
+        """
+        批量创建实体。
+
+        按列数换算每条 INSERT 的行数，使单条语句的绑定参数不超过 chunk_max_params，
+        所有分块在同一个事务中提交。
+
+        Args:
+            entities: 要创建的实体列表
+            batch_size: 每条 INSERT 包含的最大行数
+            chunk_max_params: 每条 INSERT 允许的最大绑定参数数
+            ignore_conflicts: 为 True 时生成 ON CONFLICT DO NOTHING，便于幂等重放
+
+        Returns:
+            已创建的实体列表。
+        """
+        if not entities:
+            return entities
+        params_per_row = len(self._model_cls._meta.fields_db_projection)
+        effective = max(1, min(batch_size, chunk_max_params // max(params_per_row, 1)))
         try:
-            async with in_transaction():
-                await self._model_cls.bulk_create(entities)
+            # Tortoise 按 batch_size 自行拆分为多条 INSERT
+            async with self._slot(), in_transaction() as conn:
+                await self._model_cls.bulk_create(
+                    entities,
+                    batch_size=effective,
+                    ignore_conflicts=ignore_conflicts,
+                    using_db=conn,
+                )
+            self._invalidate_cache()
             return entities
         except Exception as e:
             logger.error(f"Failed to bulk create {self._model_cls.__name__}: {e}")
             raise
 
+    async def bulk_update(
+        self,
+        entities: List[T],
+        fields: List[str],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        批量更新实体的指定字段。
+
+        每批生成一条 UPDATE ... CASE 语句，代替逐行 save()。
+
+        Args:
+            entities: 要更新的实体列表（需包含主键）
+            fields: 需要更新的字段名
+            batch_size: 每条语句包含的最大行数
+
+        Returns:
+            提交更新的实体数量。
+        """
+        if not entities:
+            return 0
+        try:
+            async with self._slot(), in_transaction() as conn:
+                await self._model_cls.bulk_update(
+                    entities, fields=fields, batch_size=batch_size, using_db=conn
+                )
+            self._invalidate_cache()
+            return len(entities)
+        except Exception as e:
+            logger.error(f"Failed to bulk update {self._model_cls.__name__}: {e}")
+            raise
+
     async def count(self, **kwargs) -> int:
         """计数"""
         try:
-            return await self._model_cls.filter(**kwargs).count()
+            key = self._cache_key("count", tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            # 过滤值不可哈希（如 __in 列表）时不走缓存
+            key = None
+        cached = self._cache_get(key) if key is not None else _MISSING
+        if cached is not _MISSING:
+            return cached
+        try:
+            async with self._slot():
+                total = await self._model_cls.filter(**kwargs).count()
         except Exception as e:
             logger.error(f"Failed to count {self._model_cls.__name__}: {e}")
             return 0
+        if key is not None:
+            self._cache_set(key, total)
+        return total
 
 
 class ConversationRepository(TortoiseRepository[AgentConversation]):
     def __init__(
-        self, db_config=None
-    ):  # db_config is not used but kept for DI compatibility
-        super().__init__(AgentConversation)
+        self, db_config: Optional[DatabaseConfig] = None, cache_ttl: float = 0.0
+    ):
+        """
+        Args:
+            db_config: 数据库配置，用于按连接池大小限制并发查询数
+            cache_ttl: 读缓存时间（秒），0 表示不缓存
+        """
+        super().__init__(AgentConversation, db_config, cache_ttl)
+
+    async def update_title(
+        self, conversation_id: Any, title: Optional[str]
+    ) -> Optional[AgentConversation]:
+        """
+        更新会话标题并返回更新后的实体。
+
+        PostgreSQL 与 SQLite ≥ 3.35 上使用一条 UPDATE ... RETURNING，一次往返完成写入与回读；
+        其他数据库先用 ORM 更新，再按主键读取一次。
+
+        Args:
+            conversation_id: 会话 ID
+            title: 新标题
+
+        Returns:
+            更新后的会话；会话不存在时返回 None。
+        """
+        db = self._model_cls._meta.db
+        now = timezone.now()
+        try:
+            async with self._slot():
+                if _supports_returning(db):
+                    rows = await self._update_title_returning(db, conversation_id, title, now)
+                    entity = rows[0] if rows else None
+                else:
+                    updated = await self._model_cls.filter(id=conversation_id).update(
+                        title=title, updated_at=now
+                    )
+                    entity = (
+                        await self._model_cls.get_or_none(id=conversation_id)
+                        if updated
+                        else None
+                    )
+        except Exception as e:
+            logger.error(
+                f"Failed to update title of {self._model_cls.__name__} {conversation_id}: {e}"
+            )
+            raise
+        if entity is not None:
+            self._invalidate_cache()
+        return entity
+
+    async def _update_title_returning(
+        self, db, conversation_id: Any, title: Optional[str], now: datetime
+    ) -> List[AgentConversation]:
+        """执行 UPDATE ... RETURNING *，由 Tortoise 的执行器把返回行构造成模型实例"""
+        meta = self._model_cls._meta
+        if db.capabilities.dialect == "postgres":
+            placeholders = ("$1", "$2", "$3")
+        else:
+            placeholders = ("?", "?", "?")
+        sql = (
+            f'UPDATE "{meta.db_table}" SET "title"={placeholders[0]}, '
+            f'"updated_at"={placeholders[1]} WHERE "id"={placeholders[2]} RETURNING *'
+        )
+        values = [
+            title,
+            meta.fields_map["updated_at"].to_db_value(now, self._model_cls),
+            meta.fields_map["id"].to_db_value(conversation_id, self._model_cls),
+        ]
+        executor = db.executor_class(model=self._model_cls, db=db)
+        return await executor.execute_select(sql, values)
+
+    async def find_by_metadata(
+        self, criteria: Dict[str, Any], limit: int = 100
+    ) -> List[AgentConversation]:
+        """
+        按元数据包含关系查找会话。
+
+        使用 JSONField 的 contains 查询，PostgreSQL 上编译为 metadata_ @> ...，
+        可命中 metadata_ 上的 GIN 索引。
+
+        Args:
+            criteria: 需要包含的键值，例如 {"resume_id": "..."}
+            limit: 返回的最大记录数
+
+        Returns:
+            匹配的会话列表。
+
+        Raises:
+            NotImplementedError: 数据库不支持 JSON 包含查询（如 SQLite）。
+        """
+        query = self._model_cls.filter(metadata___contains=criteria).limit(limit)
+        try:
+            async with self._slot():
+                return await query
+        except NotImplementedError:
+            raise
+        except Exception as e:
+            logger.error(
+                f"Failed to find {self._model_cls.__name__} by metadata {criteria}: {e}"
+            )
+            return []
+
+    async def bulk_update_titles(
+        self,
+        pairs: List[Tuple[Any, Optional[str]]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Any]:
+        """
+        批量更新会话标题。
+
+        直接用 (id, title) 构造内存实体交给 bulk_update，
+        不需要先逐条查询，也不回读数据库。
+
+        Args:
+            pairs: (会话 ID, 新标题) 列表
+            batch_size: 每条 UPDATE 包含的最大行数
+
+        Returns:
+            已提交更新的会话 ID 列表。
+        """
+        now = timezone.now()
+        entities = [
+            AgentConversation(id=conversation_id, title=title, updated_at=now)
+            for conversation_id, title in pairs
+        ]
+        await self.bulk_update(
+            entities, fields=["title", "updated_at"], batch_size=batch_size
+        )
+        return [conversation_id for conversation_id, _ in pairs]
+
+
+class MessageRepository(TortoiseRepository[AgentMessage]):
+    def __init__(
+        self, db_config: Optional[DatabaseConfig] = None, cache_ttl: float = 0.0
+    ):
+        """
+        Args:
+            db_config: 数据库配置，用于按连接池大小限制并发查询数
+            cache_ttl: 读缓存时间（秒），0 表示不缓存
+        """
+        super().__init__(AgentMessage, db_config, cache_ttl)
+
+    async def bulk_save(
+        self,
+        conversation_id: Any,
+        messages: List[Dict[str, Any]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[AgentMessage]:
+        """
+        批量保存同一会话的消息。
+
+        调用方应先在内存中累积消息，再一次性写入，
+        以多行 INSERT 代替逐条 add() 带来的多次往返。
+
+        Args:
+            conversation_id: 所属会话 ID
+            messages: 消息字段字典列表（role、content、metadata_ 等）
+            batch_size: 每条 INSERT 包含的最大行数
+
+        Returns:
+            已创建的消息实体列表。
+        """
+        entities = [
+            AgentMessage(conversation_id=conversation_id, **message)
+            for message in messages
+        ]
+        if not entities:
+            return entities
+        return await self.bulk_create(entities, batch_size=batch_size)
+
+    async def list_by_conversation(
+        self,
+        conversation_id: Any,
+        before: Optional[datetime] = None,
+        limit: int = 50,
+        include_content: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        按时间倒序分页读取会话消息。
+
+        使用 .values() 直接返回字典，跳过 ORM 实例构造，
+        适合直接序列化返回给前端的场景。
+
+        Args:
+            conversation_id: 会话 ID
+            before: 只返回早于该时间的消息（上一页最后一条的 created_at）
+            limit: 返回的最大记录数
+            include_content: 为 False 时不返回 content/metadata_ 大字段，减少传输与反序列化，
+                适用于只需要消息列表概要的场景（仍需回表读取行，联合索引只负责定位与排序）
+
+        Returns:
+            消息字典列表，按 created_at 倒序。
+        """
+        query = self._model_cls.filter(conversation_id=conversation_id)
+        if before is not None:
+            query = query.filter(created_at__lt=before)
+        columns = _MESSAGE_COLUMNS if include_content else _MESSAGE_SUMMARY_COLUMNS
+        try:
+            async with self._slot():
+                return await query.order_by("-created_at").limit(limit).values(*columns)
+        except Exception as e:
+            logger.error(
+                f"Failed to list {self._model_cls.__name__} of conversation {conversation_id}: {e}"
+            )
+            return []
@@ -4,12 +4,16 @@ AGUIAdapter单元测试
 测试事件翻译逻辑的正确性
 """
 
+import asyncio
 import json
 from unittest.mock import Mock
 
 import pytest
 from ag_ui.core.events import (
     CustomEvent,
+    EventType,
+    RunFinishedEvent,
+    RunStartedEvent,
     TextMessageChunkEvent,
     ThinkingEndEvent,
     ThinkingStartEvent,
@@ -19,7 +23,8 @@ from ag_ui.core.events import (
     ToolCallStartEvent,
 )
 
-from yai_nexus_agentkit.adapter.agui_adapter import AGUIAdapter
+from yai_nexus_agentkit.adapter import agui_adapter
+from yai_nexus_agentkit.adapter.agui_adapter import AGUIAdapter, _coalesce_frames
 from yai_nexus_agentkit.adapter.models import Task
 from yai_nexus_agentkit.adapter.tool_call_tracker import ToolCallTracker
 
@@ -96,10 +101,24 @@ class TestAGUIAdapterEventTranslation:
         args_event = events[1]
         assert isinstance(args_event, ToolCallArgsEvent)
         assert args_event.tool_call_id == start_event.tool_call_id
-        expected_args = json.dumps(
-            {"query": "test query", "max_results": 5}, ensure_ascii=False
-        )
-        assert args_event.delta == expected_args
+        assert json.loads(args_event.delta) == {"query": "test query", "max_results": 5}
+
+    @pytest.mark.asyncio
+    async def test_tool_start_with_non_str_keys(self, adapter, tool_tracker):
+        """测试工具输入包含非字符串键时仍能序列化"""
+        mock_event = {
+            "event": "on_tool_start",
+            "name": "lookup_tool",
+            "data": {"input": {1: "one", "nested": {2: [3, 4]}}},
+        }
+
+        events = []
+        async for event in adapter._translate_event(mock_event, tool_tracker):
+            events.append(event)
+
+        args_event = events[1]
+        assert isinstance(args_event, ToolCallArgsEvent)
+        assert json.loads(args_event.delta) == {"1": "one", "nested": {"2": [3, 4]}}
 
     @pytest.mark.asyncio
     async def test_tool_end_event_translation(self, adapter, tool_tracker):
@@ -133,10 +152,10 @@ class TestAGUIAdapterEventTranslation:
         result_event = events[1]
         assert isinstance(result_event, ToolCallResultEvent)
         assert result_event.tool_call_id == end_event.tool_call_id
-        expected_result = json.dumps(
-            {"results": ["result1", "result2"], "count": 2}, ensure_ascii=False
-        )
-        assert result_event.content == expected_result
+        assert json.loads(result_event.content) == {
+            "results": ["result1", "result2"],
+            "count": 2,
+        }
 
     @pytest.mark.asyncio
     async def test_chat_model_stream_translation(self, adapter, tool_tracker):
@@ -279,3 +298,115 @@ class TestAGUIAdapterIntegration:
         # 验证最后一个事件是RunFinished
         assert events[-1]["type"] == "RUN_FINISHED"
         assert events[-1]["run_id"] == "test_task"
+
+
+def _text(delta):
+    return TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta=delta)
+
+
+def _run_started():
+    return RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")
+
+
+def _run_finished():
+    return RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r")
+
+
+async def _delayed(items):
+    """按 (延迟秒数, 事件) 依次产出事件"""
+    for delay, event in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event
+
+
+def _parse_writes(writes):
+    """把每次写出的字节拆成 SSE data 帧并解析为字典"""
+    return [
+        [json.loads(frame[len(b"data: "):]) for frame in write.split(b"\n\n") if frame]
+        for write in writes
+    ]
+
+
+class TestCoalesceFrames:
+    """SSE 帧合并测试"""
+
+    @pytest.mark.asyncio
+    async def test_run_events_flush_immediately_and_text_is_merged(self):
+        events = [(0, _run_started()), (0, _text("Hel")), (0, _text("lo")), (0, _run_finished())]
+
+        writes = _parse_writes([w async for w in _coalesce_frames(_delayed(events), window=1.0)])
+
+        # RUN_STARTED 不等待窗口；文本块合并为一帧，并随 RUN_FINISHED 一起写出
+        assert [[f["type"] for f in write] for write in writes] == [
+            ["RUN_STARTED"],
+            ["TEXT_MESSAGE_CHUNK", "RUN_FINISHED"],
+        ]
+        assert writes[1][0]["delta"] == "Hello"
+
+    @pytest.mark.asyncio
+    async def test_idle_upstream_flushes_after_window(self):
+        events = [(0, _text("a")), (0, _text("b")), (0.2, _text("c"))]
+
+        writes = _parse_writes([w async for w in _coalesce_frames(_delayed(events), window=0.02)])
+
+        assert [[f["delta"] for f in write] for write in writes] == [["ab"], ["c"]]
+
+    @pytest.mark.asyncio
+    async def test_zero_window_writes_each_frame(self):
+        events = [(0, _text("a")), (0, _text("b"))]
+
+        writes = _parse_writes([w async for w in _coalesce_frames(_delayed(events), window=0)])
+
+        assert [[f["delta"] for f in write] for write in writes] == [["a"], ["b"]]
+
+
+class TestStreamTimeouts:
+    """上游超时测试"""
+
+    @staticmethod
+    async def _collect(agent):
+        adapter = AGUIAdapter(agent)
+        task = Task(id="test_task", query="test query")
+        return [event async for event in adapter.stream_events(task)]
+
+    @pytest.mark.asyncio
+    async def test_inter_event_timeout_ends_run_with_error(self, monkeypatch):
+        monkeypatch.setattr(agui_adapter, "INTER_EVENT_TIMEOUT", 0.05)
+        closed = []
+
+        async def stalled_events(*args, **kwargs):
+            try:
+                yield {"event": "on_chat_model_stream", "data": {"chunk": Mock(content="Hi")}}
+                await asyncio.sleep(10)
+            finally:
+                closed.append(True)
+
+        agent = Mock()
+        agent.astream_events = stalled_events
+
+        events = await self._collect(agent)
+
+        assert events[0].type == EventType.RUN_STARTED
+        assert events[1].delta == "Hi"
+        assert events[-1].type == EventType.RUN_ERROR
+        assert "No agent event received" in events[-1].message
+        assert closed == [True]
+
+    @pytest.mark.asyncio
+    async def test_total_stream_timeout_ends_run_with_error(self, monkeypatch):
+        monkeypatch.setattr(agui_adapter, "AGENT_STREAM_TIMEOUT", 0.1)
+        monkeypatch.setattr(agui_adapter, "INTER_EVENT_TIMEOUT", 0.05)
+
+        async def endless_events(*args, **kwargs):
+            while True:
+                await asyncio.sleep(0.01)
+                yield {"event": "on_chat_model_stream", "data": {"chunk": Mock(content=".")}}
+
+        agent = Mock()
+        agent.astream_events = endless_events
+
+        events = await self._collect(agent)
+
+        assert events[-1].type == EventType.RUN_ERROR
+        assert "Agent stream exceeded" in events[-1].message
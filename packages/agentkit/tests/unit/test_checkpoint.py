@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+PostgresCheckpoint单元测试
+测试 put 的写入行为
+"""
+
+import asyncio
+import itertools
+from unittest.mock import Mock
+
+import pytest
+
+from yai_nexus_agentkit.persistence.checkpoint import PostgresCheckpoint
+
+
+class FakeSaver:
+    """记录写入顺序的假 saver"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.writes = []
+
+    async def aput(self, convo_id, checkpoint):
+        await asyncio.sleep(self.delay)
+        self.writes.append((convo_id, checkpoint))
+
+
+def _make_checkpoint(saver: FakeSaver) -> PostgresCheckpoint:
+    """构造跳过数据库初始化的 PostgresCheckpoint"""
+    checkpoint = PostgresCheckpoint(Mock())
+    checkpoint._savers = [saver]
+    checkpoint._saver_cycle = itertools.cycle(checkpoint._savers)
+    checkpoint.saver = saver
+    checkpoint._ready = True
+    return checkpoint
+
+
+class TestPut:
+    """写入测试"""
+
+    @pytest.mark.asyncio
+    async def test_each_put_is_written_before_returning(self):
+        """每次 put 返回时对应的 checkpoint 已经写入"""
+        saver = FakeSaver()
+        checkpoint = _make_checkpoint(saver)
+
+        await checkpoint.put("c1", {"v": 1})
+        assert saver.writes == [("c1", {"v": 1})]
+
+        await checkpoint.put("c1", {"v": 2})
+        assert saver.writes == [("c1", {"v": 1}), ("c1", {"v": 2})]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_put_does_not_affect_other_callers(self):
+        """一个调用方被取消时，其他调用方的写入照常完成"""
+        saver = FakeSaver(delay=0.02)
+        checkpoint = _make_checkpoint(saver)
+
+        cancelled = asyncio.create_task(checkpoint.put("c1", {"v": 1}))
+        others = [asyncio.create_task(checkpoint.put(f"c{i}", {"v": i})) for i in range(2, 5)]
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        await asyncio.wait_for(asyncio.gather(*others), timeout=1)
+        assert sorted(cp["v"] for _, cp in saver.writes) == [2, 3, 4]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 提供商注册表单元测试
+测试 HTTP 连接池调优为显式开启
+"""
+
+import pytest
+
+from yai_nexus_agentkit.llm.internal import registry
+from yai_nexus_agentkit.llm.providers import LLMProvider
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """把 OpenAI 创建函数替换为记录收到的配置"""
+    configs = []
+    monkeypatch.setitem(
+        registry._PROVIDER_REGISTRY,
+        LLMProvider.OPENAI,
+        lambda config: configs.append(config) or config,
+    )
+    return configs
+
+
+class TestPooledHttpClient:
+    """连接池注入测试"""
+
+    def test_no_client_injected_by_default(self, captured):
+        registry.create_langchain_llm(LLMProvider.OPENAI, {"model": "gpt-4o"})
+
+        assert captured == [{"model": "gpt-4o"}]
+
+    def test_flag_is_stripped_and_proxy_is_respected(self, captured):
+        registry.create_langchain_llm(
+            LLMProvider.OPENAI,
+            {"model": "gpt-4o", "pooled_http_client": True, "openai_proxy": "http://proxy:8080"},
+        )
+
+        assert captured == [{"model": "gpt-4o", "openai_proxy": "http://proxy:8080"}]
+
+    def test_flag_injects_a_new_client_per_call(self, captured):
+        pytest.importorskip("httpx")
+        config = {"model": "gpt-4o", "pooled_http_client": True, "timeout": 30}
+
+        registry.create_langchain_llm(LLMProvider.OPENAI, config)
+        registry.create_langchain_llm(LLMProvider.OPENAI, config)
+
+        first, second = captured
+        assert "pooled_http_client" not in first
+        assert first["http_async_client"] is not second["http_async_client"]
+        assert first["http_async_client"].timeout.read == 30
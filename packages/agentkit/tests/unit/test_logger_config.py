@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+logger_config单元测试
+测试 orjson 渲染的 JSON 日志行与批量 sink 的生命周期
+"""
+
+import json
+import threading
+
+from loguru import logger
+
+from yai_nexus_agentkit.core import logger_config
+from yai_nexus_agentkit.core.logger_config import LoggerConfigurator, _orjson_format
+
+
+class TestJsonLogLine:
+    """JSON 日志行测试"""
+
+    def test_exception_rendered_as_traceback(self):
+        """测试异常以完整回溯文本输出"""
+        lines = []
+        handler_id = logger.add(lines.append, format=_orjson_format, level="DEBUG")
+        try:
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("failed")
+        finally:
+            logger.remove(handler_id)
+
+        data = json.loads(lines[0])
+        assert data["message"] == "failed"
+        assert data["level"] == "ERROR"
+        assert data["exception"].startswith("Traceback (most recent call last):")
+        assert "ValueError: boom" in data["exception"]
+        assert "_serialized" not in data["extra"]
+
+
+class TestBatchingSinkLifecycle:
+    """批量 sink 生命周期测试"""
+
+    @staticmethod
+    def _flusher_threads():
+        return [t for t in threading.enumerate() if t.name == "agentkit-log-flusher"]
+
+    def test_reconfigure_stops_previous_sink(self):
+        """测试重复配置时停止上一个批量 sink，不遗留后台线程"""
+        try:
+            LoggerConfigurator().configure_production()
+            first, _ = logger_config._batching_sink
+            LoggerConfigurator().configure_production()
+            second, _ = logger_config._batching_sink
+
+            assert first is not second
+            assert first._stopped and not first._flusher.is_alive()
+            assert self._flusher_threads() == [second._flusher]
+        finally:
+            logger_config._replace_batching_sink(None)
+            logger.remove()
+
+        assert self._flusher_threads() == []
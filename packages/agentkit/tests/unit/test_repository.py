@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+TortoiseRepository单元测试
+基于内存 SQLite 测试读缓存、分块遍历、批量写入与列投影
+"""
+
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from tortoise import Tortoise
+
+from yai_nexus_agentkit.persistence import (
+    DatabaseConfig,
+    close_database,
+    init_database,
+    repository,
+)
+from yai_nexus_agentkit.persistence.models import AgentConversation, AgentMessage
+from yai_nexus_agentkit.persistence.repository import (
+    ConversationRepository,
+    MessageRepository,
+)
+
+
+@pytest_asyncio.fixture
+async def db():
+    await Tortoise.init(
+        db_url="sqlite://:memory:",
+        modules={"models": ["yai_nexus_agentkit.persistence.models"]},
+    )
+    await Tortoise.generate_schemas()
+    # 读缓存是进程级的，每个用例从空缓存开始
+    repository._read_cache._data.clear()
+    yield
+    await Tortoise.close_connections()
+
+
+async def _create_conversations(count: int, **kwargs):
+    return [
+        await AgentConversation.create(
+            checkpoint_thread_id=uuid.uuid4(), title=f"title {i}", **kwargs
+        )
+        for i in range(count)
+    ]
+
+
+class TestPoolSemaphore:
+    """连接池并发闸门测试"""
+
+    def test_semaphore_is_per_database_and_event_loop(self):
+        async def lookup():
+            return (
+                repository._get_pool_semaphore(("sqlite://a", 2)),
+                repository._get_pool_semaphore(("sqlite://a", 2)),
+                repository._get_pool_semaphore(("sqlite://b", 2)),
+            )
+
+        first = asyncio.run(lookup())
+        second = asyncio.run(lookup())
+
+        assert first[0] is first[1]
+        assert first[0] is not first[2]
+        assert first[0] is not second[0]
+
+    @pytest.mark.asyncio
+    async def test_queries_queue_behind_the_pool_limit(self, db):
+        config = DatabaseConfig(db_url="sqlite://:memory:", max_connections=1)
+        repo = ConversationRepository(config)
+        (conversation,) = await _create_conversations(1)
+
+        found = await asyncio.gather(*(repo.get(conversation.id) for _ in range(5)))
+
+        assert all(c.id == conversation.id for c in found)
+
+
+class TestReadCache:
+    """TTL 读缓存测试"""
+
+    @pytest.mark.asyncio
+    async def test_write_through_repository_invalidates_cache(self, db):
+        repo = ConversationRepository(cache_ttl=60)
+        (conversation,) = await _create_conversations(1)
+
+        assert (await repo.get(conversation.id)).title == "title 0"
+        assert await repo.count() == 1
+
+        # 绕过仓储的写入在 TTL 内不可见
+        await AgentConversation.filter(id=conversation.id).update(title="outside")
+        assert (await repo.get(conversation.id)).title == "title 0"
+
+        # 经由仓储的写入立即使缓存失效
+        await repo.update_title(conversation.id, "inside")
+        await repo.add(AgentConversation(checkpoint_thread_id=uuid.uuid4()))
+        assert (await repo.get(conversation.id)).title == "inside"
+        assert await repo.count() == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_entity_is_not_shared_between_callers(self, db):
+        repo = ConversationRepository(cache_ttl=60)
+        (conversation,) = await _create_conversations(1, metadata_={"tags": ["a"]})
+
+        first = await repo.get(conversation.id)
+        first.title = "unsaved"
+        first.metadata_["tags"].append("b")
+        second = await repo.get(conversation.id)
+
+        assert second.title == "title 0"
+        assert second.metadata_ == {"tags": ["a"]}
+
+    @pytest.mark.asyncio
+    async def test_misses_are_not_cached(self, db):
+        repo = ConversationRepository(cache_ttl=60)
+        missing_id = uuid.uuid4()
+        assert await repo.get(missing_id) is None
+        assert not await repo.exists(missing_id)
+
+        # 其他进程创建的记录不受 TTL 影响，立即可见
+        await AgentConversation.create(id=missing_id, checkpoint_thread_id=uuid.uuid4())
+
+        assert (await repo.get(missing_id)).id == missing_id
+        assert await repo.exists(missing_id)
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled_by_default(self, db):
+        repo = ConversationRepository()
+        (conversation,) = await _create_conversations(1)
+
+        assert (await repo.get(conversation.id)).title == "title 0"
+        await AgentConversation.filter(id=conversation.id).update(title="outside")
+        assert (await repo.get(conversation.id)).title == "outside"
+
+
+class TestIter:
+    """键集分页遍历测试"""
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_by_primary_key(self, db):
+        repo = ConversationRepository()
+        conversations = await _create_conversations(7)
+
+        seen = [c async for c in repo.iter(chunk_size=3)]
+
+        assert [c.id for c in seen] == sorted(c.id for c in conversations)
+        assert all(isinstance(c, AgentConversation) for c in seen)
+
+    @pytest.mark.asyncio
+    async def test_iter_values_always_includes_primary_key(self, db):
+        repo = ConversationRepository()
+        await _create_conversations(4)
+
+        rows = [row async for row in repo.iter_values("title", chunk_size=2)]
+
+        assert len(rows) == 4
+        assert all(set(row) == {"id", "title"} for row in rows)
+
+
+class TestBulkWrites:
+    """分块批量写入测试"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_splits_by_parameter_limit(self, db):
+        repo = MessageRepository()
+        (conversation,) = await _create_conversations(1)
+        messages = [
+            AgentMessage(
+                id=uuid.uuid4(), conversation_id=conversation.id, role="user", content=str(i)
+            )
+            for i in range(5)
+        ]
+
+        # 每行 6 个参数，上限 12 个参数即每条 INSERT 最多 2 行
+        await repo.bulk_create(messages, chunk_max_params=12)
+        # 幂等重放不会因主键冲突失败
+        await repo.bulk_create(messages, chunk_max_params=12, ignore_conflicts=True)
+
+        assert await repo.count(conversation_id=conversation.id) == 5
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_titles(self, db):
+        repo = ConversationRepository()
+        first, second = await _create_conversations(2)
+
+        updated = await repo.bulk_update_titles([(first.id, "a"), (second.id, "b")], batch_size=1)
+
+        assert updated == [first.id, second.id]
+        assert (await repo.get(first.id)).title == "a"
+        assert (await repo.get(second.id)).title == "b"
+
+
+class TestProjections:
+    """列投影测试"""
+
+    @pytest.mark.asyncio
+    async def test_filter_keeps_returning_models(self, db):
+        repo = ConversationRepository()
+        await _create_conversations(2)
+
+        found = await repo.filter(title="title 1")
+
+        assert len(found) == 1
+        assert isinstance(found[0], AgentConversation)
+
+    @pytest.mark.asyncio
+    async def test_values_methods_return_selected_columns(self, db):
+        repo = ConversationRepository()
+        await _create_conversations(3)
+
+        listed = await repo.list_values("title", limit=2)
+        filtered = await repo.filter_values("id", "title", title="title 2")
+
+        assert listed == [{"title": "title 0"}, {"title": "title 1"}]
+        assert len(filtered) == 1 and filtered[0]["title"] == "title 2"
+        assert set(filtered[0]) == {"id", "title"}
+
+
+class TestConversationQueries:
+    """会话查询在非 PostgreSQL 数据库上的行为"""
+
+    @pytest.mark.asyncio
+    async def test_update_title(self, db):
+        repo = ConversationRepository()
+        (conversation,) = await _create_conversations(1)
+
+        updated = await repo.update_title(conversation.id, "renamed")
+
+        assert updated.title == "renamed"
+        assert (await AgentConversation.get(id=conversation.id)).title == "renamed"
+        assert await repo.update_title(uuid.uuid4(), "missing") is None
+
+    @pytest.mark.asyncio
+    async def test_find_by_metadata_requires_json_containment(self, db):
+        repo = ConversationRepository()
+        await _create_conversations(1, metadata_={"resume_id": "r1"})
+
+        with pytest.raises(NotImplementedError):
+            await repo.find_by_metadata({"resume_id": "r1"})
+
+
+    @pytest.mark.asyncio
+    async def test_update_title_without_returning_support(self, db, monkeypatch):
+        monkeypatch.setattr(repository, "_supports_returning", lambda db: False)
+        repo = ConversationRepository()
+        (conversation,) = await _create_conversations(1)
+
+        updated = await repo.update_title(conversation.id, "renamed")
+
+        assert updated.title == "renamed"
+        assert await repo.update_title(uuid.uuid4(), "missing") is None
+
+
+class TestInitDatabase:
+    """init_database 测试"""
+
+    @pytest.mark.asyncio
+    async def test_init_database_uses_config_and_creates_schema(self):
+        config = DatabaseConfig(db_url="sqlite://:memory:")
+
+        await init_database(config)
+        try:
+            (conversation,) = await _create_conversations(1)
+            assert await ConversationRepository().exists(conversation.id)
+        finally:
+            await close_database()
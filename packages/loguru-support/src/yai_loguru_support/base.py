@@ -7,13 +7,15 @@ ensuring consistent behavior and standardized configuration across different pro
 
 import abc
 import asyncio
+import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
 from dataclasses import dataclass, field
-from concurrent.futures import ThreadPoolExecutor
 import logging
 
 
+_T = TypeVar("_T")
+
 
 class SinkError(Exception):
     """Base exception for all sink-related errors."""
@@ -39,8 +41,14 @@ class SinkConfig:
     serialize: bool = True
     
     # 性能配置
+    # Max concurrent blocking SDK calls offloaded to threads
     max_workers: int = 4
     queue_size: int = 10000
+    # Records below this level are shed first when the queue is full;
+    # records at or above it evict the oldest queued record below this level,
+    # or wait up to queue_full_timeout seconds for space
+    discard_threshold: str = "WARNING"
+    queue_full_timeout: float = 0.05
     batch_size: int = 100
     flush_interval: float = 5.0
     
@@ -67,6 +75,7 @@ class SinkMetrics:
         """Reset all metrics to zero."""
         self.logs_sent = 0
         self.logs_failed = 0
+        self.logs_dropped = 0
         self.bytes_sent = 0
         self.connection_errors = 0
         self.last_error = None
@@ -97,6 +106,10 @@ class SinkMetrics:
         self.logs_failed += 1
         self.last_error = error
         
+    def record_drop(self) -> None:
+        """Record a log discarded because the queue was full."""
+        self.logs_dropped += 1
+        
     def record_connection_error(self) -> None:
         """Record a connection error."""
         self.connection_errors += 1
@@ -106,6 +119,7 @@ class SinkMetrics:
         return {
             "logs_sent": self.logs_sent,
             "logs_failed": self.logs_failed,
+            "logs_dropped": self.logs_dropped,
             "bytes_sent": self.bytes_sent,
             "connection_errors": self.connection_errors,
             "success_rate": self.success_rate,
@@ -134,7 +148,22 @@ class BaseSink(abc.ABC):
         self._running = False
         self._queue: Optional[asyncio.Queue] = None
         self._background_task: Optional[asyncio.Task] = None
-        self._executor = ThreadPoolExecutor(max_workers=config.max_workers)
+        # Messages already taken off the queue but not yet flushed
+        self._pending: list[str] = []
+        # Messages written from other threads, handed to the loop in batches
+        self._handoff: list[str] = []
+        self._handoff_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        # Limits concurrent _run_blocking calls; created on the loop in astart()
+        self._blocking_slots: Optional[asyncio.Semaphore] = None
+        # Severe records currently waiting for queue space
+        self._blocked_puts = 0
+        self._discard_threshold_no = logging.getLevelName(config.discard_threshold.upper())
+        if not isinstance(self._discard_threshold_no, int):
+            raise SinkConfigurationError(
+                f"Unknown discard_threshold level: {config.discard_threshold}"
+            )
         
         # Health check
         self._last_health_check = time.time()
@@ -168,6 +197,9 @@ class BaseSink(abc.ABC):
             
         self._running = True
         self._queue = asyncio.Queue(maxsize=self.config.queue_size)
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._blocking_slots = asyncio.Semaphore(self.config.max_workers)
         
         # Start background processing task
         self._background_task = asyncio.create_task(self._background_worker())
@@ -189,8 +221,6 @@ class BaseSink(abc.ABC):
         except Exception as e:
             self._internal_logger.error(f"Error during cleanup: {e}")
             
-        # Shutdown executor
-        self._executor.shutdown(wait=True)
         self._internal_logger.info(f"{self.__class__.__name__} stopped")
     
     async def astop(self) -> None:
@@ -201,8 +231,9 @@ class BaseSink(abc.ABC):
         self._internal_logger.info(f"Stopping {self.__class__.__name__}...")
         self._running = False
         
-        # Wait for queue to be processed
+        # Wait for queue to be processed, including writes still in hand-off
         if self._queue:
+            self._drain_handoff()
             await self._queue.join()
             
         # Cancel background task
@@ -213,6 +244,12 @@ class BaseSink(abc.ABC):
             except asyncio.CancelledError:
                 pass
                 
+        # Drain the partial batch the worker was holding when cancelled
+        if self._pending:
+            pending = list(self._pending)
+            self._pending.clear()
+            await self._flush_batch(pending)
+                
         # Cleanup connection
         await self._astop()
     
@@ -239,16 +276,95 @@ class BaseSink(abc.ABC):
         if not self._running or not self._queue:
             return
             
+        if self._loop is None or threading.get_ident() == self._loop_thread_id:
+            self._enqueue(message)
+            return
+            
+        # asyncio.Queue is not thread-safe: buffer messages from other threads
+        # and wake the loop once per batch instead of once per record
+        with self._handoff_lock:
+            schedule = not self._handoff
+            self._handoff.append(message)
+        if schedule:
+            try:
+                self._loop.call_soon_threadsafe(self._drain_handoff)
+            except RuntimeError:
+                # Event loop already closed; nothing left to deliver to
+                with self._handoff_lock:
+                    self._handoff.clear()
+                    
+    def _drain_handoff(self) -> None:
+        """Move messages buffered by other threads onto the queue (loop thread)."""
+        with self._handoff_lock:
+            batch, self._handoff = self._handoff, []
+        for message in batch:
+            self._enqueue(message)
+            
+    def _enqueue(self, message: str) -> None:
+        """Non-blocking queue put, applying the queue-full policy on overflow."""
         try:
-            # Non-blocking queue put
             self._queue.put_nowait(message)
         except asyncio.QueueFull:
-            self.metrics.record_failure(Exception("Queue full"))
-            self._internal_logger.warning("Log queue is full, dropping message")
+            self._on_queue_full(message)
+            
+    def _on_queue_full(self, message: str) -> None:
+        """
+        Apply the queue-full policy.
+        
+        Records below ``discard_threshold`` are dropped. More severe records
+        evict the oldest queued record below ``discard_threshold``; if every
+        queued record is at least as severe, they wait up to
+        ``queue_full_timeout`` for space and are dropped after that, so queued
+        warnings and errors are never evicted.
+        """
+        if self._level_no(message) < self._discard_threshold_no:
+            self.metrics.record_drop()
+            return
+        if self._evict_low_priority():
+            self.metrics.record_drop()
+            self._queue.put_nowait(message)
+            return
+        if (
+            self._loop is None
+            or self.config.queue_full_timeout <= 0
+            or self._blocked_puts >= self.config.queue_size
+        ):
+            self.metrics.record_drop()
+            return
+        self._blocked_puts += 1
+        self._loop.create_task(self._put_with_timeout(message))
+        
+    def _evict_low_priority(self) -> bool:
+        """Remove the oldest queued record below ``discard_threshold``, if any."""
+        # asyncio.Queue keeps its items in a deque; only scanned when full
+        items = self._queue._queue
+        for index, queued in enumerate(items):
+            if self._level_no(queued) < self._discard_threshold_no:
+                del items[index]
+                self._queue.task_done()
+                return True
+        return False
+        
+    async def _put_with_timeout(self, message: str) -> None:
+        """Wait briefly for queue space for a severe record, then drop it."""
+        try:
+            await asyncio.wait_for(self._queue.put(message), self.config.queue_full_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.record_drop()
+        finally:
+            self._blocked_puts -= 1
+            
+    @staticmethod
+    def _level_no(message: Any) -> int:
+        """Severity of a loguru message; plain strings are treated as INFO."""
+        record = getattr(message, "record", None)
+        if record is None:
+            return logging.INFO
+        return record["level"].no
             
     async def _background_worker(self) -> None:
         """Background task that processes the log queue."""
-        batch = []
+        batch = self._pending
         last_flush = time.time()
         
         while self._running or (self._queue and not self._queue.empty()):
@@ -274,14 +390,30 @@ class BaseSink(abc.ABC):
                 )
                 
                 if should_flush and batch:
-                    await self._flush_batch(batch)
+                    # Take the batch out of _pending before sending, so astop()
+                    # never re-sends a batch whose send was cancelled midway
+                    to_send = list(batch)
                     batch.clear()
                     last_flush = time.time()
+                    await self._flush_batch(to_send)
                     
             except Exception as e:
                 self._internal_logger.error(f"Error in background worker: {e}")
                 await asyncio.sleep(1)  # Prevent tight error loop
                 
+    async def _run_blocking(self, fn: Callable[..., _T], *args: Any) -> _T:
+        """
+        Run a blocking SDK call in a worker thread.
+        
+        Uses the event loop's default executor via ``asyncio.to_thread`` instead
+        of a per-sink thread pool; at most ``max_workers`` calls from this sink
+        run at once.
+        """
+        if self._blocking_slots is None:
+            self._blocking_slots = asyncio.Semaphore(self.config.max_workers)
+        async with self._blocking_slots:
+            return await asyncio.to_thread(fn, *args)
+            
     async def _flush_batch(self, messages: list[str]) -> None:
         """Flush a batch of messages to the remote service."""
         for attempt in range(self.config.max_retries + 1):
@@ -151,11 +151,7 @@ class AliyunSlsSink(BaseSink):
             # Test connection by listing logstores
             from aliyun.log import ListLogstoresRequest
             request = ListLogstoresRequest(self.sls_config.project)
-            await asyncio.get_event_loop().run_in_executor(
-                self._executor,
-                self._client.list_logstores,
-                request
-            )
+            await self._run_blocking(self._client.list_logstores, request)
             
             self._internal_logger.info(
                 f"SLS connection established to {self.sls_config.endpoint}"
@@ -260,11 +256,7 @@ class AliyunSlsSink(BaseSink):
             )
             
             # Send logs asynchronously
-            await asyncio.get_event_loop().run_in_executor(
-                self._executor,
-                self._client.put_logs,
-                request
-            )
+            await self._run_blocking(self._client.put_logs, request)
             
             return total_size
             
@@ -285,11 +277,7 @@ class AliyunSlsSink(BaseSink):
             # Simple health check: list logstores
             from aliyun.log import ListLogstoresRequest
             request = ListLogstoresRequest(self.sls_config.project)
-            await asyncio.get_event_loop().run_in_executor(
-                self._executor,
-                self._client.list_logstores,
-                request
-            )
+            await self._run_blocking(self._client.list_logstores, request)
             return True
             
         except Exception as e:
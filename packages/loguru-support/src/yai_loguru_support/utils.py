@@ -28,6 +28,8 @@ class GracefulShutdown:
         self._shutdown_callbacks: List[Callable] = []
         self._shutdown_lock = threading.Lock()
         self._shutdown_complete = False
+        # Handlers that were installed before ours, chained to after draining
+        self._previous_handlers: dict = {}
         
     def register_sink(self, sink: BaseSink) -> None:
         """Register a sink for graceful shutdown."""
@@ -75,8 +77,12 @@ class GracefulShutdown:
         shutdown_tasks = []
         for sink in self._sinks:
             try:
-                # Check if sink has async stop method
-                if hasattr(sink, 'stop') and callable(getattr(sink, 'stop')):
+                # Prefer the awaitable astop so pending batches are drained
+                # before we return, instead of a fire-and-forget stop()
+                astop_method = getattr(sink, 'astop', None)
+                if astop_method is not None and asyncio.iscoroutinefunction(astop_method):
+                    shutdown_tasks.append(asyncio.create_task(astop_method()))
+                elif hasattr(sink, 'stop') and callable(getattr(sink, 'stop')):
                     stop_method = getattr(sink, 'stop')
                     if asyncio.iscoroutinefunction(stop_method):
                         # Async stop method
@@ -102,7 +108,36 @@ class GracefulShutdown:
                 print(f"Error during sink shutdown: {e}")
                 
     def setup_signal_handlers(self) -> None:
-        """Setup signal handlers for graceful shutdown."""
+        """
+        Setup signal handlers for graceful shutdown.
+        
+        When called from inside a running event loop the handlers are
+        installed with ``loop.add_signal_handler`` so the shutdown runs as a
+        task on that loop and cooperates with ``asyncio.run``. Otherwise it
+        falls back to ``signal.signal``.
+        
+        The handlers only flush and stop the registered sinks; afterwards the
+        signal is passed on to whatever handler was installed before (e.g.
+        uvicorn's), so the host application's own shutdown still runs.
+        """
+        self._previous_handlers = {
+            sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+            
+        if loop is not None:
+            try:
+                for sig in (signal.SIGINT, signal.SIGTERM):
+                    loop.add_signal_handler(sig, self._on_loop_signal, loop, sig)
+                return
+            except (NotImplementedError, RuntimeError):
+                # Windows event loops do not support add_signal_handler
+                pass
+                
         def signal_handler(signum, frame):
             print(f"Received signal {signum}, initiating graceful shutdown...")
             try:
@@ -118,13 +153,38 @@ class GracefulShutdown:
                 # No event loop, create a new one
                 asyncio.run(self.shutdown_all())
             finally:
-                # Exit gracefully
-                exit(0)
+                self._chain_signal(signum, frame)
                 
         # Register signal handlers
         signal.signal(signal.SIGINT, signal_handler)   # Ctrl+C
         signal.signal(signal.SIGTERM, signal_handler)  # Termination signal
         
+    def _on_loop_signal(self, loop: asyncio.AbstractEventLoop, signum: int) -> None:
+        """Loop-level signal callback: drain sinks, then hand the signal on."""
+        print(f"Received signal {signum}, initiating graceful shutdown...")
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(sig)
+            
+        async def _drain_and_chain():
+            try:
+                await self.shutdown_all()
+            finally:
+                self._chain_signal(signum, None)
+                        
+        loop.create_task(_drain_and_chain())
+        
+    def _chain_signal(self, signum: int, frame: Any) -> None:
+        """Restore the previously installed handler and deliver the signal to it."""
+        previous = self._previous_handlers.get(signum)
+        if previous is None:
+            # Installed outside Python (or never recorded): use the default action
+            previous = signal.SIG_DFL
+        signal.signal(signum, previous)
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            signal.raise_signal(signum)
+        
     def setup_atexit(self) -> None:
         """Setup atexit handler for graceful shutdown."""
         def atexit_handler():
@@ -3,6 +3,8 @@ Tests for base sink functionality.
 """
 
 import asyncio
+import threading
+import time
 import pytest
 
 from yai_loguru_support.base import BaseSink, SinkConfig, SinkMetrics
@@ -96,6 +98,102 @@ class TestSinkMetrics:
         assert "uptime" in data
 
 
+class _LevelMessage(str):
+    """String message carrying a loguru-like record with a level number."""
+    
+    def __new__(cls, text, level_no):
+        obj = super().__new__(cls, text)
+        obj.record = {"level": type("Level", (), {"no": level_no})()}
+        return obj
+
+
+class TestQueueFullPolicy:
+    """Test the queue-full discard policy."""
+    
+    def _full_sink(self):
+        sink = MockSink(SinkConfig(queue_size=2))
+        sink._running = True
+        sink._queue = asyncio.Queue(maxsize=2)
+        sink.write(_LevelMessage("info 1", 20))
+        sink.write(_LevelMessage("info 2", 20))
+        return sink
+        
+    def test_low_level_dropped_when_full(self):
+        sink = self._full_sink()
+        sink.write(_LevelMessage("debug", 10))
+        
+        assert sink._queue.qsize() == 2
+        assert sink.metrics.logs_dropped == 1
+        assert "debug" not in list(sink._queue._queue)
+        
+    def test_warning_evicts_oldest_when_full(self):
+        sink = self._full_sink()
+        sink.write(_LevelMessage("error", 40))
+        
+        assert list(sink._queue._queue) == ["info 2", "error"]
+        assert sink.metrics.logs_dropped == 1
+        assert sink.get_metrics()["logs_dropped"] == 1
+
+
+class TestCrossThreadHandoff:
+    """Test batched hand-off of writes from non-loop threads."""
+    
+    def test_writes_from_threads_are_delivered(self):
+        import threading
+        
+        async def run():
+            sink = MockSink(SinkConfig(batch_size=10, flush_interval=0.05))
+            await sink.astart()
+            
+            def produce(n):
+                for i in range(50):
+                    sink.write(f"thread {n} message {i}")
+                    
+            threads = [threading.Thread(target=produce, args=(n,)) for n in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+                
+            await asyncio.sleep(0.1)
+            await sink.astop()
+            return sink
+            
+        sink = asyncio.run(run())
+        assert len(sink.sent_messages) == 200
+        assert sink._handoff == []
+
+
+class TestRunBlocking:
+    """Test offloading blocking calls without a per-sink thread pool."""
+    
+    def test_concurrency_bounded_by_max_workers(self):
+        import threading
+        
+        lock = threading.Lock()
+        active = []
+        peak = []
+        
+        def blocking(n):
+            with lock:
+                active.append(n)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(n)
+            return n * 2
+        
+        async def run():
+            sink = MockSink(SinkConfig(max_workers=2))
+            await sink.astart()
+            results = await asyncio.gather(*(sink._run_blocking(blocking, n) for n in range(6)))
+            await sink.astop()
+            return results
+        
+        assert asyncio.run(run()) == [0, 2, 4, 6, 8, 10]
+        assert max(peak) <= 2
+
+
 @pytest.mark.asyncio
 class TestBaseSink:
     """Test BaseSink functionality."""
@@ -202,4 +300,68 @@ class TestBaseSink:
         await sink.stop()
         
         # Messages should have been flushed during shutdown
-        assert len(sink.sent_messages) == 2
\ No newline at end of file
+        assert len(sink.sent_messages) == 2
+
+class TestStopDuringSend:
+    """Test astop() while the worker is in the middle of a send."""
+    
+    def test_cancelled_send_is_not_resent(self):
+        class SlowSink(MockSink):
+            async def _send_batch(self, messages):
+                self.sent_messages.extend(messages)
+                await asyncio.sleep(10)
+                return 0
+        
+        async def run():
+            sink = SlowSink(SinkConfig(batch_size=2, flush_interval=0.01, max_retries=0))
+            await sink.astart()
+            sink.write("message 1")
+            sink.write("message 2")
+            await asyncio.sleep(0.05)
+            await sink.astop()
+            return sink
+            
+        sink = asyncio.run(run())
+        assert sink.sent_messages == ["message 1", "message 2"]
+        assert sink._pending == []
+
+
+class TestQueueFullKeepsSevereRecords:
+    """Test that a full queue of severe records is never evicted."""
+    
+    def _sink(self, timeout):
+        sink = MockSink(SinkConfig(queue_size=2, queue_full_timeout=timeout))
+        sink._running = True
+        sink._queue = asyncio.Queue(maxsize=2)
+        sink._loop = asyncio.get_running_loop()
+        sink._loop_thread_id = threading.get_ident()
+        sink.write(_LevelMessage("error 1", 40))
+        sink.write(_LevelMessage("error 2", 40))
+        return sink
+        
+    def test_warning_waits_for_space_instead_of_evicting(self):
+        async def run():
+            sink = self._sink(timeout=1.0)
+            sink.write(_LevelMessage("warning", 30))
+            await asyncio.sleep(0)
+            assert list(sink._queue._queue) == ["error 1", "error 2"]
+            
+            # Space frees up within the timeout: the warning gets in
+            sink._queue.get_nowait()
+            await asyncio.sleep(0.01)
+            return sink
+            
+        sink = asyncio.run(run())
+        assert list(sink._queue._queue) == ["error 2", "warning"]
+        assert sink.metrics.logs_dropped == 0
+        
+    def test_warning_dropped_after_timeout(self):
+        async def run():
+            sink = self._sink(timeout=0.01)
+            sink.write(_LevelMessage("warning", 30))
+            await asyncio.sleep(0.05)
+            return sink
+            
+        sink = asyncio.run(run())
+        assert list(sink._queue._queue) == ["error 1", "error 2"]
+        assert sink.metrics.logs_dropped == 1
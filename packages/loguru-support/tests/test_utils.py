@@ -0,0 +1,35 @@
+"""
+Tests for shutdown utilities.
+"""
+
+import asyncio
+import signal
+
+from yai_loguru_support.utils import GracefulShutdown
+
+
+class TestSignalChaining:
+    """Test that loop signal handling drains sinks and defers to the previous handler."""
+    
+    def test_loop_signal_chains_to_previous_handler(self):
+        received = []
+        original = signal.getsignal(signal.SIGTERM)
+        signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+        
+        async def run():
+            shutdown = GracefulShutdown()
+            shutdown.register_callback(lambda: received.append("drained"))
+            shutdown.setup_signal_handlers()
+            
+            bystander = asyncio.ensure_future(asyncio.sleep(0.2))
+            signal.raise_signal(signal.SIGTERM)
+            await asyncio.sleep(0.05)
+            # Other tasks on the loop are left alone
+            assert not bystander.done()
+            bystander.cancel()
+            
+        try:
+            asyncio.run(run())
+            assert received == ["drained", signal.SIGTERM]
+        finally:
+            signal.signal(signal.SIGTERM, original)